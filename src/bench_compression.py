@@ -0,0 +1,156 @@
+# visionverse_dashboard/src/bench_compression.py
+"""Benchmark the size-targeting engine against the old step-down compressor.
+
+    python -m src.bench_compression                  # synthetic reference set
+    python -m src.bench_compression --dir photos/ --targets 100 500
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .image_compression import DRAFT_MIN_PIXELS, compress_to_target, open_for_target
+
+REFERENCE_SIZES = [(1024, 768), (1920, 1080), (3000, 2000), (4000, 3000), (6000, 4000)]
+DECODE_SIZES = [(5472, 3648), (6000, 4000), (8000, 6000)]
+
+
+def legacy_compress(img, target_size_kb):
+    """The original loop: quality 95→10 in steps of 5, then 10% shrinks. Returns (kb, dims, encodes)."""
+    encodes = 0
+    quality = 95
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    while quality > 5:
+        img_bytes = io.BytesIO()
+        img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
+        encodes += 1
+        size_kb = img_bytes.tell() / 1024
+        if size_kb <= target_size_kb:
+            break
+        quality -= 5
+    if size_kb > target_size_kb:
+        width, height = img.size
+        while size_kb > target_size_kb and width > 200 and height > 200:
+            width = int(width * 0.9)
+            height = int(height * 0.9)
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+            img_bytes = io.BytesIO()
+            img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
+            encodes += 1
+            size_kb = img_bytes.tell() / 1024
+    return size_kb, img.size, encodes
+
+
+def synthetic_image(size, seed):
+    """Photo-like test image: gradients, shapes and sensor-style noise."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([
+        127 + 100 * np.sin(xx / (w / rng.uniform(2, 6)) + rng.uniform(0, 6)),
+        127 + 100 * np.cos(yy / (h / rng.uniform(2, 6)) + rng.uniform(0, 6)),
+        127 + 100 * np.sin((xx + yy) / ((w + h) / rng.uniform(2, 8))),
+    ], axis=-1)
+    base += rng.normal(0, 12, base.shape)
+    img = Image.fromarray(np.clip(base, 0, 255).astype(np.uint8), "RGB")
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x0, y0 = rng.integers(0, w), rng.integers(0, h)
+        x1, y1 = x0 + rng.integers(10, w // 4), y0 + rng.integers(10, h // 4)
+        draw.rectangle([x0, y0, x1, y1], outline=tuple(int(v) for v in rng.integers(0, 255, 3)), width=3)
+    return img
+
+
+def reference_set(directory=None):
+    if directory:
+        for path in sorted(Path(directory).rglob("*")):
+            if path.suffix.lower() in (".jpg", ".jpeg", ".png"):
+                yield path.name, Image.open(path)
+        return
+    for i, size in enumerate(REFERENCE_SIZES):
+        yield f"synthetic_{size[0]}x{size[1]}", synthetic_image(size, i)
+
+
+def _timed(func):
+    t = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - t
+
+
+def _decoded_mb(data, dims):
+    """Size of the RGB buffer a draft decode towards `dims` allocates."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", dims)
+        return img.size[0] * img.size[1] * 3 / (1024 * 1024)
+
+
+def bench_decode(targets, directory=None):
+    """Full decode vs draft-mode decode for large JPEG sources (open + compress)."""
+    if directory:
+        sources = [(p.name, p.read_bytes()) for p in sorted(Path(directory).rglob("*"))
+                   if p.suffix.lower() in (".jpg", ".jpeg")]
+    else:
+        sources = []
+        for i, size in enumerate(DECODE_SIZES):
+            buf = io.BytesIO()
+            synthetic_image(size, i).save(buf, "JPEG", quality=92)
+            sources.append((f"synthetic_{size[0]}x{size[1]}.jpg", buf.getvalue()))
+
+    def full(data, target):
+        img = Image.open(io.BytesIO(data))
+        img.load()
+        return compress_to_target(img, target)
+
+    def draft(data, target):
+        img, _ = open_for_target(data, target)
+        return compress_to_target(img, target)
+
+    print(f"\n{'JPEG source':<28}{'KB':>6} | {'full s':>7}{'dec MB':>8}{'KB':>8} | {'draft s':>7}{'dec MB':>8}{'KB':>8}{'dims':>12}")
+    for name, data in sources:
+        with Image.open(io.BytesIO(data)) as img:
+            full_dims = img.size
+        if full_dims[0] * full_dims[1] < DRAFT_MIN_PIXELS:
+            continue
+        full_mb = full_dims[0] * full_dims[1] * 3 / (1024 * 1024)
+        for target in targets:
+            a, a_s = _timed(lambda: full(data, target))
+            b, b_s = _timed(lambda: draft(data, target))
+            b_mb = _decoded_mb(data, b.dims) if b.dims != full_dims else full_mb
+            print(f"{name[:27]:<28}{target:>6} | {a_s:>7.2f}{full_mb:>8.0f}{a.size_kb:>8.1f} | "
+                  f"{b_s:>7.2f}{b_mb:>8.0f}{b.size_kb:>8.1f}{'x'.join(map(str, b.dims)):>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare encode counts and wall time of the compressors.")
+    parser.add_argument("--dir", help="directory of reference images (default: synthetic set)")
+    parser.add_argument("--targets", type=int, nargs="+", default=[50, 100, 500])
+    args = parser.parse_args(argv)
+
+    header = f"{'image':<28}{'KB':>6} | {'old enc':>7}{'old s':>8}{'old KB':>8} | {'new enc':>7}{'new s':>8}{'new KB':>8}{'dims':>12}"
+    print(header)
+    print("-" * len(header))
+    totals = np.zeros(4)
+    for name, img in reference_set(args.dir):
+        img.load()
+        for target in args.targets:
+            t = time.perf_counter()
+            old_kb, _, old_enc = legacy_compress(img, target)
+            old_s = time.perf_counter() - t
+            t = time.perf_counter()
+            new = compress_to_target(img, target)
+            new_s = time.perf_counter() - t
+            totals += (old_enc, old_s, new.encodes, new_s)
+            print(f"{name[:27]:<28}{target:>6} | {old_enc:>7}{old_s:>8.2f}{old_kb:>8.1f} | "
+                  f"{new.encodes:>7}{new_s:>8.2f}{new.size_kb:>8.1f}{'x'.join(map(str, new.dims)):>12}")
+    print("-" * len(header))
+    print(f"{'total':<35}| {int(totals[0]):>7}{totals[1]:>8.2f}{'':>8} | {int(totals[2]):>7}{totals[3]:>8.2f}")
+
+    bench_decode(args.targets, args.dir)
+
+
+if __name__ == "__main__":
+    main()
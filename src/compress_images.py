@@ -0,0 +1,172 @@
+# visionverse_dashboard/src/compress_images.py
+"""Headless batch compressor: walk a directory tree and compress every image in parallel.
+
+    python -m src.compress_images photos/ out/ --target-kb 100
+    python -m src.compress_images /nas/batch_12 /nas/batch_12_small --format AUTO --workers 8
+
+Progress is appended to a JSONL manifest (default <output>/manifest.jsonl) as each
+file finishes, so an interrupted run picks up where it stopped. Files whose manifest
+entry matches the source (size, mtime, target, format) and whose output still exists
+are skipped; failures are retried on the next run.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .image_cache import ImageCache
+from .image_compression import AUTO, IMAGE_EXTENSIONS, OUTPUT_FORMATS, compress_many, output_name, pool_size
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def find_images(source_dir, exclude=None):
+    """Relative POSIX paths of every image under `source_dir`, skipping `exclude` (the output tree)."""
+    source_dir = Path(source_dir)
+    exclude = Path(exclude).resolve() if exclude else None
+    for path in sorted(source_dir.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in IMAGE_EXTENSIONS or path.name.startswith("._"):
+            continue
+        if exclude is not None and exclude in path.resolve().parents:
+            continue
+        yield path.relative_to(source_dir).as_posix()
+
+
+def load_manifest(path):
+    """Latest entry per source from a JSONL manifest; a torn last line (killed mid-write) is ignored."""
+    entries = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry["source"]] = entry
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _fingerprint(path):
+    st = path.stat()
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def is_up_to_date(entry, fingerprint, target_kb, output_format, output_dir):
+    if not entry or entry.get("error") or entry.get("target_kb") != target_kb or entry.get("format") != output_format:
+        return False
+    if any(entry.get(k) != v for k, v in fingerprint.items()):
+        return False
+    return (Path(output_dir) / entry["output"]).is_file()
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def run(source_dir, output_dir, target_kb, output_format="JPEG", workers=None, manifest_path=None,
+        force=False, use_cache=False, log=print):
+    """Compress the tree; returns counts {'compressed', 'skipped', 'failed', 'original_kb', 'compressed_kb'}."""
+    source_dir, output_dir = Path(source_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = Path(manifest_path or output_dir / MANIFEST_NAME)
+    manifest = {} if force else load_manifest(manifest_path)
+    cache = ImageCache() if use_cache else None
+
+    jobs, fingerprints = [], {}
+    stats = {"compressed": 0, "skipped": 0, "failed": 0, "original_kb": 0.0, "compressed_kb": 0.0}
+    for rel in find_images(source_dir, exclude=output_dir):
+        fingerprint = _fingerprint(source_dir / rel)
+        if is_up_to_date(manifest.get(rel), fingerprint, target_kb, output_format, output_dir):
+            stats["skipped"] += 1
+            continue
+        fingerprints[rel] = fingerprint
+        jobs.append((rel, str(source_dir / rel)))
+
+    total = len(jobs)
+    log(f"{total} to compress, {stats['skipped']} already up to date")
+    if not total:
+        return stats
+
+    def completed():
+        # Cache hits are served in-process as they are found; only misses go to the pool.
+        misses, keys = [], {}
+        for rel, path in jobs:
+            if cache is None:
+                misses.append((rel, path))
+                continue
+            data = Path(path).read_bytes()
+            key = keys[rel] = cache.key(data, target_kb, output_format)
+            hit = cache.get(key)
+            if hit is None:
+                misses.append((rel, path))
+            else:
+                yield rel, dict(hit, name=rel, original_size=len(data) / 1024), None
+        for rel, result, error in compress_many(misses, target_kb, workers, output_format):
+            if result is not None and cache is not None:
+                cache.put(keys[rel], result)
+            yield rel, result, error
+
+    started = time.perf_counter()
+    with open(manifest_path, "a", encoding="utf-8") as manifest_file:
+        for done, (rel, result, error) in enumerate(completed(), 1):
+            entry = {"source": rel, "target_kb": target_kb, "format": output_format, **fingerprints[rel]}
+            if error is not None:
+                entry["error"] = f"{type(error).__name__}: {error}"
+                stats["failed"] += 1
+                log(f"[{done}/{total}] FAILED {rel}: {entry['error']}")
+            else:
+                out_rel = output_name(rel, result["format"])
+                _write_atomic(output_dir / out_rel, result["data"])
+                entry.update(
+                    output=out_rel,
+                    output_format=result["format"],
+                    original_kb=round(result["original_size"], 1),
+                    compressed_kb=round(result["compressed_size"], 1),
+                    original_dims=list(result["original_dims"]),
+                    compressed_dims=list(result["compressed_dims"]),
+                )
+                stats["compressed"] += 1
+                stats["original_kb"] += result["original_size"]
+                stats["compressed_kb"] += result["compressed_size"]
+                log(f"[{done}/{total}] {rel} → {out_rel} {result['original_size']:.1f} KB → {result['compressed_size']:.1f} KB")
+            entry["compressed_at"] = time.time()
+            manifest_file.write(json.dumps(entry) + "\n")
+            manifest_file.flush()
+
+    elapsed = time.perf_counter() - started
+    log(f"done in {elapsed:.1f}s: {stats['compressed']} compressed, {stats['skipped']} skipped, "
+        f"{stats['failed']} failed; {stats['original_kb'] / 1024:.1f} MB → {stats['compressed_kb'] / 1024:.1f} MB")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress every image under a directory to a KB target.")
+    parser.add_argument("source", help="directory to walk")
+    parser.add_argument("output", help="directory for compressed files (mirrors the source tree)")
+    parser.add_argument("--target-kb", type=int, default=100)
+    parser.add_argument("--format", default="JPEG", choices=list(OUTPUT_FORMATS) + [AUTO], type=str.upper)
+    parser.add_argument("--workers", type=int, default=None, help=f"process pool size (default {pool_size()})")
+    parser.add_argument("--manifest", help=f"JSONL manifest path (default <output>/{MANIFEST_NAME})")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and recompress everything")
+    parser.add_argument("--cache", action="store_true", help="also use the shared on-disk image cache")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not Path(args.source).is_dir():
+        parser.error(f"{args.source} is not a directory")
+    stats = run(args.source, args.output, args.target_kb, args.format, args.workers, args.manifest,
+                args.force, args.cache, log=(lambda *_: None) if args.quiet else print)
+    sys.exit(1 if stats["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
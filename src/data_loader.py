@@ -1,8 +1,11 @@
 # visionverse_dashboard/src/data_loader.py
+import numpy as np
 import pandas as pd
 import streamlit as st
-import os
 import re
+from .profiler import span
+from .settings import get_setting
+from .sheet_fetch import fetch_csv
 
 # Your published Google Sheet CSV link
 DEFAULT_GOOGLE_SHEET_CSV = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQI2WohwqGbKw24Q7I1SeVXXlPoL_DDaAmUdq-S2YTonJWPPPp3POsdSRuuTgQjZEZXSBYLxkKZeyEc/pub?gid=0&single=true&output=csv"
@@ -25,22 +28,15 @@ def _to_csv_export_url(url: str) -> str:
 
 def _get_google_sheet_csv_url() -> str:
     """Resolve URL from Streamlit secrets or env, then normalize to CSV export."""
-    configured = None
-    try:
-        configured = st.secrets.get("GOOGLE_SHEET_URL") or st.secrets.get("GOOGLE_SHEET_CSV")
-    except Exception:
-        configured = None
-
-    if not configured:
-        configured = os.getenv("GOOGLE_SHEET_URL") or os.getenv("GOOGLE_SHEET_CSV")
-
+    configured = get_setting("GOOGLE_SHEET_URL", "GOOGLE_SHEET_CSV")
     return _to_csv_export_url(configured or DEFAULT_GOOGLE_SHEET_CSV)
 
 @st.cache_data(ttl=600)  # Cache for 600 seconds (auto refresh every 10 minutes)
 def load_team_data(role_map):
     csv_url = _get_google_sheet_csv_url()
     try:
-        df = pd.read_csv(csv_url)
+        with span("load_team_data.fetch"):
+            df, fetch_meta = fetch_csv(csv_url)
     except Exception as e:
         msg = str(e)
         if "401" in msg or "403" in msg:
@@ -65,32 +61,71 @@ def load_team_data(role_map):
     date_columns = []
     normalized_header = {}
     seen_headers = set()
+    dropped_headers = []
     for col in raw_date_columns:
         base = re.sub(r'\.\d+$', '', str(col)).strip()
         if not base:
             continue
         if base in seen_headers:
+            dropped_headers.append({'Header': str(col), 'Date': base})
             continue
         seen_headers.add(base)
         date_columns.append(col)
         normalized_header[col] = base
 
-    df_long = df.melt(
-        id_vars=[col for col in ['Name', 'Rename', 'Role'] if col in df.columns],
-        value_vars=date_columns,
-        var_name='Date',
-        value_name='Cuboids'
-    )
+    with span("load_team_data.melt"):
+        df_long = df.melt(
+            id_vars=[col for col in ['Name', 'Rename', 'Role'] if col in df.columns],
+            value_vars=date_columns,
+            var_name='Date',
+            value_name='Cuboids'
+        )
 
-    # Normalize the melted date header back to its base value (strip .1/.2 suffixes).
-    df_long['Date'] = df_long['Date'].astype(str).map(normalized_header).fillna(df_long['Date'])
+        # Normalize the melted date header back to its base value (strip .1/.2 suffixes).
+        df_long['Date'] = df_long['Date'].astype(str).map(normalized_header).fillna(df_long['Date'])
 
-    df_long['Cuboids'] = pd.to_numeric(df_long['Cuboids'], errors='coerce')
-    df_long = df_long.dropna(subset=['Cuboids'])
+        df_long['Cuboids'] = pd.to_numeric(df_long['Cuboids'], errors='coerce')
+        df_long = df_long.dropna(subset=['Cuboids'])
 
     if 'Role' not in df_long.columns or df_long['Role'].isnull().all():
         df_long['Role'] = df_long['Rename'].map(role_map)
     else:
         df_long['Role'] = df_long['Role'].fillna(df_long['Rename'].map(role_map))
 
+    # Served from the last known good copy when the sheet is unreachable.
+    df_long.attrs['stale'] = fetch_meta['stale']
+    df_long.attrs['fetched_at'] = fetch_meta['fetched_at']
+    df_long.attrs['fetch_error'] = fetch_meta['error']
+    # Repeated date headers that were skipped above, for data validation
+    df_long.attrs['duplicate_headers'] = dropped_headers
     return df_long
+
+
+def parse_date_headers(values: pd.Series, today=None) -> pd.DataFrame:
+    """Parse sheet date headers ('Jul 25', '23/04/2025') once per distinct value.
+
+    Returns 'parsed' (headers without a year get the current year, nothing else
+    adjusted) and 'has_year', aligned with `values`.
+    """
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    codes, distinct = pd.factorize(values.astype("string").str.strip())
+    text = pd.Series(distinct, dtype="string")
+    has_year = text.str.contains(r"\d{4}", regex=True).fillna(False).astype(bool)
+    parsed = pd.to_datetime(text.where(has_year), errors="coerce", dayfirst=True, format="mixed")
+    parsed = parsed.fillna(pd.to_datetime(text.where(~has_year) + f" {today.year}", errors="coerce", format="mixed"))
+    # Missing headers have code -1, which picks the trailing sentinel
+    lookup = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT"))
+    flags = np.append(has_year.to_numpy(), False)
+    return pd.DataFrame({"parsed": lookup[codes], "has_year": flags[codes]}, index=values.index)
+
+
+def header_dates(values: pd.Series, today=None) -> pd.Series:
+    """Sheet date headers -> normalized dates.
+
+    Dates in the future move back a year; anything unparseable or outside
+    2000..next year becomes NaT.
+    """
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    parsed = parse_date_headers(values, today)["parsed"]
+    parsed = parsed.where(parsed.dt.year.between(2000, today.year + 1))
+    return parsed.where(parsed <= today, parsed - pd.DateOffset(years=1)).dt.normalize().rename(None)
@@ -1,5 +1,9 @@
 import pandas as pd
 import streamlit as st
+from urllib.parse import urlsplit
+from .profiler import span
+from .settings import get_setting
+from .sheet_fetch import fetch_csv
 
 # Mapping of sheet names to their gid values
 SHEET_GID_MAP = {
@@ -16,16 +20,33 @@ SHEET_GID_MAP = {
 
 BASE_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ9liiuyZqTQ7g13ORQMgdxZbTbQ2HZ1NQH8SE5ibVfn2N9AgtszltWd9-cjZKtj4gI1VnTaR_ZpoNH/pub?gid={gid}&single=true&output=csv"
 
+def _quality_sheet_url(gid: str) -> str:
+    """CSV URL for a quality tab; QUALITY_SHEET_BASE_URL may be a full '{gid}' template
+    or just an origin (e.g. http://127.0.0.1:8765) that replaces docs.google.com."""
+    override = get_setting("QUALITY_SHEET_BASE_URL")
+    if not override:
+        return BASE_URL.format(gid=gid)
+    if "{gid}" in override:
+        return override.format(gid=gid)
+    default = urlsplit(BASE_URL)
+    return override.rstrip("/") + default.path + "?" + default.query.format(gid=gid)
+
 @st.cache_data(ttl=600)
 def load_quality_data(sheet_name="Sheet1"):
     gid = SHEET_GID_MAP.get(sheet_name, "0")
-    url = BASE_URL.format(gid=gid)
+    url = _quality_sheet_url(gid)
     try:
-        df = pd.read_csv(url)
+        with span(f"load_quality_data.fetch[{sheet_name}]"):
+            # Job IDs stay text, so numeric ids don't become 123.0 and miss the maker/editor logs
+            df, fetch_meta = fetch_csv(url, dtype={"JOB_ID": "string", "Job ID": "string"})
     except Exception as e:
         st.error(f"Failed to load quality data: {e}")
         return pd.DataFrame()
 
+    if fetch_meta["stale"]:
+        fetched = pd.Timestamp(fetch_meta["fetched_at"], unit="s").strftime("%Y-%m-%d %H:%M UTC")
+        st.warning(f"Quality sheet '{sheet_name}' is unreachable ({fetch_meta['error']}); showing data from {fetched}.")
+
     df.columns = df.columns.str.strip()
     df = df.rename(columns={
         "Telus Names": "Rename",
@@ -0,0 +1,123 @@
+# visionverse_dashboard/src/data_store.py
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from .settings import get_setting
+
+# Process-wide store of datasets and derived results, keyed by (name, data version).
+# Shared read-only by every session; evicted oldest-version-first under a memory budget.
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+_LOCK = threading.RLock()
+_ENTRIES = OrderedDict()
+_BUDGET = {"mb": None}
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """Content hash of a frame (values, columns and dtypes); stable across reruns."""
+    h = hashlib.sha1()
+    h.update(repr(list(df.columns)).encode())
+    h.update(repr([str(t) for t in df.dtypes]).encode())
+    if not df.empty:
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:12]
+
+
+def deep_size(obj) -> int:
+    """Best-effort deep memory usage in bytes."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k) + deep_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(v) for v in obj)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(obj)
+
+
+def memory_budget_mb() -> float:
+    if _BUDGET["mb"] is None:
+        try:
+            _BUDGET["mb"] = float(get_setting("MEMORY_BUDGET_MB", default=DEFAULT_MEMORY_BUDGET_MB))
+        except (TypeError, ValueError):
+            _BUDGET["mb"] = float(DEFAULT_MEMORY_BUDGET_MB)
+    return _BUDGET["mb"]
+
+
+def get(name, version, builder):
+    """Return the value for (name, version), building it once if missing."""
+    key = (name, version)
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        if entry is not None:
+            entry["last_used"] = time.time()
+            return entry["value"]
+    value = builder()
+    return put(name, version, value)
+
+
+def put(name, version, value):
+    """Store a value; if another session stored it first, keep and return that one."""
+    key = (name, version)
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        if entry is None:
+            now = time.time()
+            entry = {"value": value, "bytes": deep_size(value), "created": now, "last_used": now}
+            _ENTRIES[key] = entry
+            enforce_budget(protect=key)
+        return entry["value"]
+
+
+def share(name, df: pd.DataFrame):
+    """Intern a loaded dataset so all sessions share one copy; returns (df, version)."""
+    version = data_version(df)
+    return put(name, version, df), version
+
+
+def total_bytes() -> int:
+    with _LOCK:
+        return sum(e["bytes"] for e in _ENTRIES.values())
+
+
+def enforce_budget(protect=None):
+    """Evict superseded versions first, then any oldest entry, until under budget."""
+    budget = memory_budget_mb() * 1024 * 1024
+    with _LOCK:
+        if total_bytes() <= budget:
+            return
+        latest = {}
+        for name, version in _ENTRIES:
+            latest[name] = (name, version)
+        superseded = [k for k in _ENTRIES if latest[k[0]] != k]
+        for key in superseded + list(_ENTRIES):
+            if total_bytes() <= budget:
+                break
+            if key == protect or key not in _ENTRIES:
+                continue
+            del _ENTRIES[key]
+
+
+def entries() -> pd.DataFrame:
+    with _LOCK:
+        rows = [{
+            "Name": name,
+            "Version": version,
+            "MB": e["bytes"] / (1024 * 1024),
+            "Created": pd.Timestamp(e["created"], unit="s"),
+            "Last used": pd.Timestamp(e["last_used"], unit="s"),
+        } for (name, version), e in _ENTRIES.items()]
+    return pd.DataFrame(rows, columns=["Name", "Version", "MB", "Created", "Last used"])
+
+
+def clear():
+    with _LOCK:
+        _ENTRIES.clear()
@@ -1,24 +1,140 @@
 # visionverse_dashboard/src/data_validation.py
-import streamlit as st
+import warnings
+
+import numpy as np
 import pandas as pd
+import streamlit as st
+from . import data_store, roster
+from .data_loader import parse_date_headers
+from .profiler import span, timed
+
+# Outliers are judged against the annotator's own recent history: a robust z-score of
+# each day's count against the median/MAD of their previous OUTLIER_WINDOW entries.
+OUTLIER_WINDOW = 28
+OUTLIER_MIN_HISTORY = 10
+OUTLIER_Z = 3.5
+KNOWN_ROLES = ["Maker", "Editor"]
+ISSUE_COLUMNS = ["Check", "Severity", "Rename", "Role", "Date", "Cuboids", "Detail"]
+
+
+def _issues(check, severity, rows, detail):
+    """Issue rows for `check` from a frame with Rename/Role/Date/Cuboids (missing ones left blank)."""
+    out = pd.DataFrame({c: rows[c] if c in rows.columns else pd.NA for c in ["Rename", "Role", "Date", "Cuboids"]},
+                       index=rows.index)
+    out.insert(0, "Check", check)
+    out.insert(1, "Severity", severity)
+    out["Detail"] = detail
+    return out[ISSUE_COLUMNS]
+
+
+def robust_z(values, groups, window=OUTLIER_WINDOW, min_history=OUTLIER_MIN_HISTORY):
+    """Robust z-score of each value against the median/MAD of the previous `window` values in its group.
+
+    `values` must already be ordered within each group. The (rows × window) history is
+    gathered with one fancy index, so every annotator is scored at once; NaN where a
+    group has fewer than `min_history` earlier values or no spread.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return np.array([], dtype=float)
+    codes = pd.factorize(np.asarray(groups, dtype=object))[0]
+    pos = np.arange(n)
+    group_start = pd.Series(pos).groupby(codes).transform("min").to_numpy()
+    lookback = pos[:, None] - np.arange(window, 0, -1)[None, :]
+    in_group = lookback >= group_start[:, None]
+    history = np.where(in_group, values[np.clip(lookback, 0, None)], np.nan)
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        median = np.nanmedian(history, axis=1)
+        mad = np.nanmedian(np.abs(history - median[:, None]), axis=1)
+        z = 0.6745 * (values - median) / np.where(mad > 0, mad, np.nan)
+    z[in_group.sum(axis=1) < min_history] = np.nan
+    return z
+
+
+@timed("validation.validate")
+def validate(df: pd.DataFrame, today=None) -> pd.DataFrame:
+    """Every check over the long team frame in one pass; one row per issue (ISSUE_COLUMNS)."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    found = []
+
+    cuboids = pd.to_numeric(df["Cuboids"], errors="coerce")
+    found.append(_issues("Non-positive count", "warning", df[cuboids.isna() | (cuboids <= 0)],
+                         "Cuboid count is missing, zero or negative"))
 
-def render_data_validation(df):
+    # Dates: parsed once per distinct header
+    headers = parse_date_headers(df["Date"], today)
+    parsed = headers["parsed"]
+    found.append(_issues("Unparseable date", "error", df[parsed.isna()], "Date header could not be read"))
+    impossible = parsed.notna() & ~parsed.dt.year.between(2000, today.year + 1)
+    found.append(_issues("Impossible date", "error", df[impossible], "Year outside 2000 to next year"))
+    future = parsed.notna() & ~impossible & headers["has_year"] & (parsed > today)
+    found.append(_issues("Future date", "error", df[future], "Dated after today"))
+
+    duplicates = pd.DataFrame(df.attrs.get("duplicate_headers") or [], columns=["Header", "Date"])
+    if not duplicates.empty:
+        found.append(_issues("Duplicated date header", "warning", duplicates,
+                             "Repeated column " + duplicates["Header"] + " was ignored; first column kept"))
+
+    # People: one row per name, not per day
+    people = df.drop_duplicates("Rename")
+    role = people["Role"].astype("string") if "Role" in people.columns else pd.Series(pd.NA, index=people.index)
+    found.append(_issues("Unknown role", "warning", people[~role.isin(KNOWN_ROLES).fillna(False).astype(bool)],
+                         "Role is not Maker or Editor; targets fall back to the editor target"))
+    names = people["Rename"].astype("string").str.strip()
+    found.append(_issues("Not in roster", "warning", people[~names.isin(roster.known_names()).fillna(False).astype(bool)],
+                         "Name does not match any roster name or alias"))
+
+    # Per-annotator outliers against their own rolling median/MAD
+    valid = df[cuboids.gt(0) & parsed.notna() & ~impossible]
+    if not valid.empty:
+        ordered = valid.assign(_date=parsed[valid.index]).sort_values(["Rename", "_date"], kind="stable")
+        z = robust_z(pd.to_numeric(ordered["Cuboids"]), ordered["Rename"])
+        flagged = ordered[np.abs(np.nan_to_num(z)) > OUTLIER_Z]
+        detail = [f"{'Above' if v > 0 else 'Below'} own recent median (robust z {v:+.1f})"
+                  for v in z[np.abs(np.nan_to_num(z)) > OUTLIER_Z]]
+        found.append(_issues("Outlier", "warning", flagged, detail))
+
+    found = [f for f in found if not f.empty]
+    return pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=ISSUE_COLUMNS)
+
+
+def validation_report(df: pd.DataFrame, version=None) -> pd.DataFrame:
+    """validate(), once per data version (and day, for the future-date check)."""
+    version = version or data_store.data_version(df)
+    duplicates = len(df.attrs.get("duplicate_headers") or [])
+    today = pd.Timestamp.today().normalize()
+    key = f"{version}:{duplicates}:{today.date()}"
+    with span("validation.report"):
+        return data_store.get("validation", key, lambda: validate(df, today))
+
+
+def render_data_validation(df, data_version=None):
     st.title("🧪 Data Validation Checks")
 
-    st.markdown("### Missing or Invalid Entries")
-    issues = df[df['Cuboids'].isna() | (df['Cuboids'] <= 0)]
+    if df is None or df.empty:
+        st.warning("No data provided to validate.")
+        return
 
+    issues = validation_report(df, data_version)
     if issues.empty:
-        st.success("✅ No missing or invalid cuboid counts detected.")
-    else:
-        st.warning(f"⚠️ Found {len(issues)} issues in cuboid entries.")
-        st.dataframe(issues)
-
-    st.markdown("### Outliers (Above 2000 Cuboids)")
-    outliers = df[df['Cuboids'] > 2000]
-
-    if not outliers.empty:
-        st.error(f"🚨 {len(outliers)} potential outliers detected.")
-        st.dataframe(outliers)
-    else:
-        st.success("✅ No cuboid count outliers found.")
\ No newline at end of file
+        st.success("✅ No data issues detected.")
+        return
+
+    counts = issues.groupby(["Check", "Severity"], sort=False).size().reset_index(name="Issues")
+    errors = int(counts.loc[counts["Severity"] == "error", "Issues"].sum())
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Issues", f"{len(issues):,}")
+    col2.metric("Errors", f"{errors:,}")
+    col3.metric("Annotators affected", f"{issues['Rename'].nunique():,}")
+    st.dataframe(counts, hide_index=True)
+
+    for check, rows in issues.groupby("Check", sort=False):
+        severity = rows["Severity"].iloc[0]
+        label = f"{'🚨' if severity == 'error' else '⚠️'} {check} ({len(rows)})"
+        with st.expander(label, expanded=severity == "error"):
+            st.dataframe(rows.drop(columns=["Check", "Severity"]).dropna(axis=1, how="all"), hide_index=True)
+
+    st.caption(f"Outliers: robust z-score beyond ±{OUTLIER_Z} against each annotator's previous "
+               f"{OUTLIER_WINDOW} entries (at least {OUTLIER_MIN_HISTORY} needed).")
@@ -0,0 +1,116 @@
+# visionverse_dashboard/src/forecast.py
+import numpy as np
+import pandas as pd
+from . import data_store, targets
+from .data_loader import header_dates
+from .profiler import span, timed
+from .work_calendar import PERIOD_WEEKMASKS, availability, holidays, leave, person_days, working_days
+
+# End-of-period projections by bootstrap: each remaining working day of a person is drawn
+# from their own last HISTORY_DAYS daily totals, SIMULATIONS times, for the whole roster
+# in one (people × simulations × days) draw. Seeded, so a data version always gives the same answer.
+HISTORY_DAYS = 20
+MIN_HISTORY = 3
+SIMULATIONS = 2000
+SEED = 7
+HORIZONS = {"Week": "Weekly", "Month": "Monthly"}
+FORECAST_COLUMNS = ["Rename", "Role", "Horizon", "Period end", "Done", "Target", "Days left",
+                    "P10", "Projected", "P90", "P(hit target)"]
+
+
+def period_bounds(as_of, horizon):
+    """(start, end) of the week (Mon-Fri) or calendar month containing `as_of`."""
+    as_of = pd.Timestamp(as_of).normalize()
+    if horizon == "Week":
+        start = as_of - pd.Timedelta(days=as_of.weekday())
+        return start, start + pd.Timedelta(days=4)
+    start = as_of.replace(day=1)
+    return start, start + pd.offsets.MonthEnd(0)
+
+
+def _daily_totals(df):
+    dates = df["Date_dt"] if "Date_dt" in df.columns else header_dates(df["Date"])
+    frame = pd.DataFrame({"Rename": df["Rename"], "Date": pd.to_datetime(dates).dt.normalize(),
+                          "Cuboids": pd.to_numeric(df["Cuboids"], errors="coerce")}).dropna()
+    return frame.groupby(["Rename", "Date"])["Cuboids"].sum().reset_index()
+
+
+def _recent_matrix(daily, names, as_of, history_days):
+    """(people × history_days) of each person's latest daily totals up to as_of, NaN-padded, plus counts."""
+    recent = daily[daily["Date"] <= as_of].sort_values(["Rename", "Date"])
+    recent = recent[recent.groupby("Rename").cumcount(ascending=False) < history_days]
+    row = pd.Index(names).get_indexer(recent["Rename"])
+    recent, row = recent[row >= 0], row[row >= 0]
+    col = recent.groupby("Rename").cumcount().to_numpy()
+    matrix = np.full((len(names), history_days), np.nan)
+    matrix[row, col] = recent["Cuboids"].to_numpy()
+    return matrix, np.bincount(row, minlength=len(names))
+
+
+def simulate(history, counts, days_left, done, simulations=SIMULATIONS, seed=SEED):
+    """Bootstrap end-of-period totals: (people × simulations) array.
+
+    history (people × H, NaN-padded, values first), counts (people,), days_left (people,), done (people,).
+    """
+    rng = np.random.default_rng(seed)
+    people, horizon = len(counts), int(days_left.max()) if len(days_left) else 0
+    if people == 0 or horizon == 0:
+        return np.repeat(done[:, None].astype(float), simulations, axis=1)
+    picks = (rng.random((people, simulations, horizon)) * np.maximum(counts, 1)[:, None, None]).astype(int)
+    draws = np.nan_to_num(history)[np.arange(people)[:, None, None], picks]
+    draws *= np.arange(horizon)[None, None, :] < days_left[:, None, None]
+    return done[:, None] + draws.sum(axis=2)
+
+
+@timed("forecast.build")
+def build_forecast(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
+    """Per person and horizon (current week, current month): done so far, target, days left,
+    P10/median/P90 projected totals and the probability of reaching the target."""
+    daily = _daily_totals(df)
+    if daily.empty:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+    as_of = daily["Date"].max() if as_of is None else pd.Timestamp(as_of).normalize()
+    people = df.drop_duplicates("Rename").dropna(subset=["Rename"])
+    names = people["Rename"].to_numpy()
+    roles = people["Role"].to_numpy() if "Role" in people.columns else np.full(len(names), None)
+    history, counts = _recent_matrix(daily, names, as_of, HISTORY_DAYS)
+
+    frames = []
+    for horizon, view in HORIZONS.items():
+        start, end = period_bounds(as_of, horizon)
+        weekmask = PERIOD_WEEKMASKS[view]
+        days = working_days(start, end, weekmask)
+        in_period = daily[(daily["Date"] >= start) & (daily["Date"] <= as_of)]
+        done = in_period.groupby("Rename")["Cuboids"].sum().reindex(names, fill_value=0).to_numpy()
+        days_left = person_days(pd.Series(names), start, end, weekmask, as_of=as_of)["Days remaining"].to_numpy()
+        target = targets.period_targets(pd.Series(names), pd.Series(roles), days,
+                                        available=availability(names, days)).to_numpy()
+
+        totals = simulate(history, counts, days_left, done)
+        enough = counts >= MIN_HISTORY
+        p10, p50, p90 = np.percentile(totals, [10, 50, 90], axis=1)
+        hit = (totals >= target[:, None]).mean(axis=1)
+        frames.append(pd.DataFrame({
+            "Rename": names, "Role": roles, "Horizon": horizon, "Period end": end,
+            "Done": done, "Target": target, "Days left": days_left,
+            "P10": np.where(enough, p10, np.nan), "Projected": np.where(enough, p50, np.nan),
+            "P90": np.where(enough, p90, np.nan),
+            "P(hit target)": np.where(enough | (days_left == 0), hit, np.nan),
+        }))
+    return pd.concat(frames, ignore_index=True)[FORECAST_COLUMNS]
+
+
+def forecast_for(df: pd.DataFrame, version=None) -> pd.DataFrame:
+    """build_forecast() once per data version (and targets, leave and holidays version)."""
+    version = version or data_store.data_version(df)
+    calendar = pd.concat([targets.load_targets().astype(str), leave().astype(str),
+                          pd.DataFrame({"holiday": holidays().astype(str)})])
+    calendar_version = data_store.data_version(calendar)
+    with span("forecast.lookup"):
+        return data_store.get("forecast", f"{version}:{calendar_version}", lambda: build_forecast(df))
+
+
+def risk_ranking(forecast: pd.DataFrame, horizon="Month") -> pd.DataFrame:
+    """One horizon, least likely to hit target first."""
+    rows = forecast[forecast["Horizon"] == horizon]
+    return rows.sort_values(["P(hit target)", "Projected"], na_position="last", ignore_index=True)
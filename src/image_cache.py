@@ -0,0 +1,86 @@
+# visionverse_dashboard/src/image_cache.py
+"""Content-addressed on-disk cache of compressed images with size-bounded LRU eviction."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "visionverse_image_cache"
+DEFAULT_CACHE_MAX_MB = 1024
+
+# Bump whenever the compressor's output for the same input and target changes.
+ENGINE_VERSION = "5"
+
+
+class ImageCache:
+    """Entries are <key>.bin (compressed bytes) plus <key>.json (stats); mtime is the LRU clock."""
+
+    def __init__(self, directory=None, max_mb=None):
+        self.directory = Path(directory or os.getenv("IMAGE_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_bytes = int(float(max_mb or os.getenv("IMAGE_CACHE_MAX_MB") or DEFAULT_CACHE_MAX_MB) * 1024 * 1024)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total = None
+
+    @staticmethod
+    def key(data, target_size_kb, output_format="JPEG"):
+        h = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{h}:{target_size_kb}:{output_format}:{ENGINE_VERSION}".encode()).hexdigest()
+
+    def _paths(self, key):
+        return self.directory / f"{key}.bin", self.directory / f"{key}.json"
+
+    def get(self, key):
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            data = data_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        os.utime(meta_path)
+        meta["data"] = data
+        meta["original_dims"] = tuple(meta["original_dims"])
+        meta["compressed_dims"] = tuple(meta["compressed_dims"])
+        return meta
+
+    def put(self, key, result):
+        data_path, meta_path = self._paths(key)
+        meta = {k: v for k, v in result.items() if k not in ("data", "name")}
+        for path, payload in ((data_path, result["data"]), (meta_path, json.dumps(meta).encode())):
+            fd, tmp = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        with self._lock:
+            if self._total is not None:
+                self._total += len(result["data"])
+        self.evict()
+
+    def size_bytes(self):
+        return sum(p.stat().st_size for p in self.directory.glob("*.bin"))
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size bound."""
+        with self._lock:
+            if self._total is None:
+                self._total = self.size_bytes()
+            if self._total <= self.max_bytes:
+                return
+            entries = []
+            for meta_path in self.directory.glob("*.json"):
+                data_path = meta_path.with_suffix(".bin")
+                try:
+                    entries.append((meta_path.stat().st_mtime, data_path.stat().st_size, meta_path, data_path))
+                except OSError:
+                    continue
+            for _, size, meta_path, data_path in sorted(entries):
+                if self._total <= self.max_bytes:
+                    break
+                for path in (meta_path, data_path):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._total -= size
@@ -0,0 +1,386 @@
+# visionverse_dashboard/src/image_compression.py
+"""Size-targeting compression (JPEG, WebP, AVIF, palette PNG) shared by the image compressor tools."""
+import io
+import math
+import os
+import zipfile
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import PurePosixPath
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image, features
+
+MIN_QUALITY = 10
+MAX_QUALITY = 95
+QUALITY_TOLERANCE = 5      # stop bisecting once the bracket is as narrow as the old step
+MIN_SIDE = 200             # never shrink the shorter side below this
+SCALE_SAFETY = 0.95        # aim slightly under the target when estimating a scale
+SCALE_SETTLE = 0.8         # a downscale filling at least this share of the target is kept
+MAX_SCALE_ATTEMPTS = 5
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Reduced-resolution JPEG decoding for large inputs that will be downscaled anyway
+DRAFT_MIN_PIXELS = 4_000_000
+PROBE_REDUCTION = 8        # probe decode at 1/8 scale (DCT scaling, nearly free)
+PROBE_BIAS = 1.15          # a 1/8 probe overestimates full-size bytes per pixel by ~15%
+JOBS_PER_WORKER = 2        # in-flight jobs per worker when streaming a ZIP
+
+# Output formats. "AUTO" tries formats in AUTO_ORDER and keeps the most faithful one that fits.
+AUTO = "AUTO"
+OUTPUT_FORMATS = ("JPEG", "WEBP", "PNG") + (("AVIF",) if features.check("avif") else ())
+FORMAT_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png", "AVIF": ".avif"}
+SOURCE_EXTENSIONS = {"JPEG": (".jpg", ".jpeg"), "PNG": (".png",)}
+ALPHA_FORMATS = {"WEBP", "PNG", "AVIF"}
+MIN_PNG_COLORS = 2
+AUTO_ORDER = ("AVIF", "WEBP", "JPEG", "PNG")   # most efficient codec first, so AUTO can stop early
+AUTO_GOOD_QUALITY = 75     # a full-size result at or above this quality ends the AUTO search
+PHOTO_MIN_COLORS = 4096    # more distinct colours than this: photographic, no palette PNG
+
+
+class CompressionResult(NamedTuple):
+    data: io.BytesIO
+    size_kb: float
+    dims: tuple
+    quality: int
+    encodes: int
+    format: str = "JPEG"
+
+
+def _has_alpha(img):
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def _prepare(img, output_format):
+    """Convert to a mode the format can encode; JPEG flattens transparency onto white."""
+    if _has_alpha(img):
+        img = img.convert("RGBA")
+        if output_format not in ALPHA_FORMATS:
+            flat = Image.new("RGB", img.size, (255, 255, 255))
+            flat.paste(img, mask=img.getchannel("A"))
+            return flat
+        return img
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
+def _png_colors(quality):
+    """Map the 10–95 quality scale onto a 2–256 colour palette, geometrically."""
+    frac = (quality - MIN_QUALITY) / (MAX_QUALITY - MIN_QUALITY)
+    return max(MIN_PNG_COLORS, min(256, round(MIN_PNG_COLORS * (256 / MIN_PNG_COLORS) ** frac)))
+
+
+def _encode(img, quality, output_format="JPEG"):
+    buf = io.BytesIO()
+    if output_format == "PNG":
+        method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        img.quantize(_png_colors(quality), method=method).save(buf, format="PNG", optimize=True)
+    elif output_format == "JPEG":
+        img.save(buf, format="JPEG", quality=quality, optimize=True)
+    else:
+        img.save(buf, format=output_format, quality=quality)
+    return buf
+
+
+def compress_to_target(img, target_size_kb, min_quality=MIN_QUALITY, max_quality=MAX_QUALITY,
+                       output_format="JPEG"):
+    """Encode `img` in `output_format` at the highest quality that fits `target_size_kb`.
+
+    Quality (palette size for PNG) is bisected between `min_quality` and
+    `max_quality`. If even `min_quality` is too large, the image is downscaled
+    until `min_quality` fits, and quality is then bisected again at that size.
+    Each new scale comes from the sizes measured so far (bytes ~ scale**k, with k
+    fitted per image), so codecs whose output shrinks slower than the pixel count
+    are not overshrunk. AUTO delegates to compress_best.
+    """
+    if output_format == AUTO:
+        return compress_best(img, target_size_kb, min_quality, max_quality)[0]
+    img = _prepare(img, output_format)
+    target = target_size_kb * 1024
+    encodes = 0
+
+    def encode(image, quality):
+        nonlocal encodes
+        encodes += 1
+        buf = _encode(image, quality, output_format)
+        return buf, buf.tell()
+
+    def result(buf, size, image, quality):
+        buf.seek(0)
+        return CompressionResult(buf, size / 1024, image.size, quality, encodes, output_format)
+
+    def best_quality(image, floor_buf, floor_size):
+        """Bisect quality on `image`, given that `min_quality` fits; invariant: lo fits, hi does not."""
+        lo, hi = min_quality, max_quality
+        best, best_size = floor_buf, floor_size
+        while hi - lo > QUALITY_TOLERANCE:
+            mid = (lo + hi) // 2
+            buf, size = encode(image, mid)
+            if size <= target:
+                lo, best, best_size = mid, buf, size
+            else:
+                hi = mid
+        return result(best, best_size, image, lo)
+
+    best, size = encode(img, max_quality)
+    if size <= target:
+        return result(best, size, img, max_quality)
+
+    floor_buf, floor_size = encode(img, min_quality)
+    if floor_size <= target:
+        return best_quality(img, floor_buf, floor_size)
+
+    # Even the lowest quality is too large: find the largest scale where it fits. The
+    # bracket is (fits, too big); each step fits bytes ~ scale**k to the last two measurements.
+    width, height = img.size
+    min_scale = min(1.0, MIN_SIDE / min(width, height))
+    fit, too_big = None, (1.0, floor_size)
+    scale, size, exponent = 1.0, floor_size, 2.0
+    for _ in range(MAX_SCALE_ATTEMPTS):
+        guess = scale * (target * SCALE_SAFETY / size) ** (1 / exponent)
+        if fit is None:
+            guess = max(min_scale, min(guess, too_big[0] * SCALE_SAFETY))
+        elif not fit[0] < guess < too_big[0]:
+            guess = math.sqrt(fit[0] * too_big[0])
+        resized = img.resize((max(1, round(width * guess)), max(1, round(height * guess))), Image.Resampling.LANCZOS)
+        buf, new_size = encode(resized, min_quality)
+        if guess != scale and new_size != size:
+            exponent = min(3.0, max(0.5, math.log(new_size / size) / math.log(guess / scale)))
+        scale, size = guess, new_size
+        if size <= target:
+            fit = (scale, resized, buf, size)
+            if size >= target * SCALE_SETTLE:
+                break
+        else:
+            too_big = (scale, size)
+            if scale <= min_scale:
+                break
+        if fit and too_big[0] / fit[0] < 1.02:
+            break
+    if fit is None:
+        return result(buf, size, resized, min_quality)
+    _, resized, buf, size = fit
+    return best_quality(resized, buf, size)
+
+
+def is_photographic(img):
+    """True when the image has too many distinct colours for a palette PNG to be faithful."""
+    return _prepare(img, "PNG").getcolors(PHOTO_MIN_COLORS) is None
+
+
+def fidelity(img, result):
+    """PSNR (dB) of a compressed result against `img` at full size; inf when identical."""
+    reference = _prepare(img, "PNG")
+    with Image.open(result.data) as decoded:
+        decoded = decoded.convert(reference.mode)
+        if decoded.size != reference.size:
+            decoded = decoded.resize(reference.size, Image.Resampling.LANCZOS)
+        diff = np.asarray(decoded, dtype=np.float32) - np.asarray(reference, dtype=np.float32)
+    result.data.seek(0)
+    mse = float(np.mean(diff * diff))
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def compress_best(img, target_size_kb, min_quality=MIN_QUALITY, max_quality=MAX_QUALITY, formats=OUTPUT_FORMATS):
+    """Keep the format whose result fits and is most faithful to the original at full size.
+
+    Formats are tried in AUTO_ORDER; the search stops at the first full-size result
+    with quality of at least AUTO_GOOD_QUALITY. Palette PNG is skipped for
+    photographic images. Returns (result, {format: size_kb}) for the formats tried;
+    the result's `encodes` counts every encode.
+    """
+    formats = [f for f in AUTO_ORDER if f in formats] + [f for f in formats if f not in AUTO_ORDER]
+    if "PNG" in formats and len(formats) > 1 and is_photographic(img):
+        formats.remove("PNG")
+    scored = []
+    for fmt in formats:
+        r = compress_to_target(img, target_size_kb, min_quality, max_quality, fmt)
+        scored.append((r.size_kb <= target_size_kb, fidelity(img, r), r))
+        if r.size_kb <= target_size_kb and r.dims == img.size and r.quality >= AUTO_GOOD_QUALITY:
+            break
+    best = max(scored, key=lambda s: s[:2])[2]
+    return best._replace(encodes=sum(s[2].encodes for s in scored)), {s[2].format: s[2].size_kb for s in scored}
+
+
+def output_name(name, output_format):
+    """Name for the encoded file: unchanged when its extension already matches the format,
+    otherwise the format's extension is appended (a.png -> a.png.webp), so sources that
+    differ only by extension never map to the same output."""
+    ext = FORMAT_EXTENSIONS.get(output_format)
+    if ext is None or PurePosixPath(name).suffix.lower() in SOURCE_EXTENSIONS.get(output_format, (ext,)):
+        return name
+    return name + ext
+
+
+def _open(source):
+    return Image.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+
+
+def open_for_target(source, target_size_kb, min_quality=MIN_QUALITY):
+    """Open an image, decoding large JPEGs directly at a reduced scale when they must shrink.
+
+    A 1/8-scale probe decode predicts the bytes per pixel at `min_quality`. If the
+    predicted scale is at most 1/2, the JPEG is decoded with PIL's draft mode at the
+    smallest power-of-two reduction still above the predicted size, then resized once
+    to it with LANCZOS. Returns (image, original_dims).
+    """
+    if hasattr(source, "read"):
+        source.seek(0)
+        source = source.read()
+    img = _open(source)
+    width, height = original_dims = img.size
+    if img.format != "JPEG" or width * height < DRAFT_MIN_PIXELS:
+        return img, original_dims
+
+    with _open(source) as probe:
+        probe.draft("RGB", (width // PROBE_REDUCTION, height // PROBE_REDUCTION))
+        probe = probe.convert("RGB")
+        probe_bytes = _encode(probe, min_quality).tell()
+        predicted = probe_bytes * (width * height) / (probe.size[0] * probe.size[1]) / PROBE_BIAS
+
+    scale = math.sqrt(target_size_kb * 1024 / predicted) * SCALE_SAFETY
+    scale = max(scale, MIN_SIDE / min(width, height))
+    if scale > 0.5:
+        return img, original_dims
+
+    target_dims = (max(1, round(width * scale)), max(1, round(height * scale)))
+    img.draft("RGB", target_dims)
+    img = img.convert("RGB")
+    if img.size != target_dims:
+        img = img.resize(target_dims, Image.Resampling.LANCZOS)
+    return img, original_dims
+
+
+def pool_size():
+    """Worker count for the machine (respects CPU affinity where available)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def compress_file(source, name, target_size_kb, output_format="JPEG"):
+    """Worker entry point: compress a path or bytes, returning picklable results.
+
+    With AUTO, 'candidates' maps every format tried to its size in KB.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        original_kb = len(source) / 1024
+    else:
+        original_kb = os.path.getsize(source) / 1024
+    img, original_dims = open_for_target(source, target_size_kb)
+    candidates = None
+    with img:
+        if output_format == AUTO:
+            result, candidates = compress_best(img, target_size_kb)
+        else:
+            result = compress_to_target(img, target_size_kb, output_format=output_format)
+    return {
+        "name": name,
+        "format": result.format,
+        "candidates": candidates,
+        "data": result.data.getvalue(),
+        "compressed_size": result.size_kb,
+        "original_size": original_kb,
+        "original_dims": original_dims,
+        "compressed_dims": result.dims,
+    }
+
+
+def compress_many(jobs, target_size_kb, workers=None, output_format="JPEG"):
+    """Compress (name, source) jobs across a process pool.
+
+    Yields (name, result, error) in completion order; exactly one of result/error is set.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    with ProcessPoolExecutor(max_workers=min(workers or pool_size(), len(jobs))) as pool:
+        futures = {pool.submit(compress_file, source, name, target_size_kb, output_format): name for name, source in jobs}
+        for future in as_completed(futures):
+            name = futures.pop(future)   # drop the finished future so its result can be freed
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                yield name, None, e
+
+
+def _is_image_member(info):
+    path = PurePosixPath(info.filename)
+    return (not info.is_dir()
+            and path.suffix.lower() in IMAGE_EXTENSIONS
+            and path.parts[0] != "__MACOSX"
+            and not path.name.startswith("._"))
+
+
+def compress_cached(data, name, target_size_kb, cache=None, output_format="JPEG"):
+    """Compress in-process, going through `cache` (an image_cache.ImageCache) when given."""
+    key = cache.key(data, target_size_kb, output_format) if cache is not None else None
+    hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        return dict(hit, name=name, original_size=len(data) / 1024)
+    result = compress_file(data, name, target_size_kb, output_format)
+    if key is not None:
+        cache.put(key, result)
+    return result
+
+
+def compress_zip_members(source_zip, target_size_kb, workers=None, cache=None, output_format="JPEG"):
+    """Compress images read straight from a ZIP (path or file-like), without extracting.
+
+    Yields (name, result, error, done, total) in completion order. Only a few
+    jobs per worker are in flight, so memory stays bounded by a handful of images.
+    With a `cache`, already-compressed members are yielded straight from it and
+    every new result is stored as soon as it completes.
+    """
+    with zipfile.ZipFile(source_zip) as zin, ExitStack() as stack:
+        images = [m for m in zin.infolist() if _is_image_member(m)]
+        total = len(images)
+        if not total:
+            return
+        members = iter(images)
+        workers = min(workers or pool_size(), total)
+        window = workers * JOBS_PER_WORKER
+        pool = None
+        pending = {}
+        done = 0
+        while True:
+            while len(pending) < window:
+                member = next(members, None)
+                if member is None:
+                    break
+                data = zin.read(member)
+                key = cache.key(data, target_size_kb, output_format) if cache is not None else None
+                hit = cache.get(key) if key is not None else None
+                if hit is not None:
+                    done += 1
+                    yield member.filename, dict(hit, name=member.filename, original_size=len(data) / 1024), None, done, total
+                    continue
+                if pool is None:
+                    pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                pending[pool.submit(compress_file, data, member.filename, target_size_kb, output_format)] = (member.filename, key)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = pending.pop(future)
+                done += 1
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                if result is not None and key is not None:
+                    cache.put(key, result)
+                yield name, result, error, done, total
+
+
+def _is_compressed(data):
+    return (data[:2] == b"\xff\xd8"                                # JPEG
+            or data[:8] == b"\x89PNG\r\n\x1a\n"
+            or (data[:4] == b"RIFF" and data[8:12] == b"WEBP")
+            or data[4:12] in (b"ftypavif", b"ftypavis"))
+
+
+def add_to_zip(zout, arcname, data):
+    """Store already-compressed images as-is; deflate anything else."""
+    compress_type = zipfile.ZIP_STORED if _is_compressed(data) else zipfile.ZIP_DEFLATED
+    zout.writestr(arcname, data, compress_type=compress_type)
@@ -1,81 +1,49 @@
 import streamlit as st
-from PIL import Image
 import io
-import os
-import zipfile
-import tempfile
-import shutil
+# Run as a script (streamlit run src/img.py); the shared image modules live in the src package
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pathlib import PurePosixPath
+from src.image_cache import ImageCache
+from src.image_compression import compress_cached, compress_zip_members
+from src.result_store import ResultStore
 
 MAX_SIZE_KB = 100
 
-def compress_image(img, format, target_size_kb=100):
-    quality = 95
-    img_bytes = io.BytesIO()
-
-    # Convert to RGB if image is in P or RGBA mode (JPEG can't handle these)
-    if img.mode in ("RGBA", "P"):
-        img = img.convert("RGB")
-
-    # Try to reduce quality and size iteratively
-    while quality > 5:
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
-        size_kb = img_bytes.tell() / 1024
-        if size_kb <= target_size_kb:
-            break
-        quality -= 5
-
-    # If still too large, try resizing
-    if size_kb > target_size_kb:
-        width, height = img.size
-        while size_kb > target_size_kb and width > 200 and height > 200:
-            width = int(width * 0.9)
-            height = int(height * 0.9)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
-            size_kb = img_bytes.tell() / 1024
-
-    img_bytes.seek(0)
-    return img_bytes
+@st.cache_resource
+def _image_cache():
+    return ImageCache()
 
 def process_single_image(uploaded_file):
-    image = Image.open(uploaded_file)
-    format = image.format
-    compressed_bytes = compress_image(image, format)
-    return compressed_bytes, uploaded_file.name
+    result = compress_cached(uploaded_file.getvalue(), uploaded_file.name, MAX_SIZE_KB, _image_cache())
+    return io.BytesIO(result["data"]), uploaded_file.name
 
 def process_zip(uploaded_zip):
-    temp_zip_file = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        zip_path = os.path.join(temp_dir, "uploaded.zip")
-        with open(zip_path, "wb") as f:
-            f.write(uploaded_zip.read())
-
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-
-        output_dir = os.path.join(temp_dir, "compressed")
-        os.makedirs(output_dir, exist_ok=True)
-
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                if file.lower().endswith((".jpg", ".jpeg", ".png")):
-                    full_path = os.path.join(root, file)
-                    try:
-                        img = Image.open(full_path)
-                        format = img.format
-                        compressed = compress_image(img, format)
-                        with open(os.path.join(output_dir, file), "wb") as f:
-                            f.write(compressed.read())
-                    except:
-                        continue
-
-        # Create ZIP file outside the temporary folder so it doesn't get deleted
-        shutil.make_archive(temp_zip_file.name.replace(".zip", ""), 'zip', output_dir)
-
-    return temp_zip_file.name
+    """Write results into a disk-backed ResultStore, so memory holds only the images in flight."""
+    store = ResultStore()
+    failures = []
+    progress = st.progress(0)
+    with store:
+        for name, result, error, done, total in compress_zip_members(uploaded_zip, MAX_SIZE_KB, cache=_image_cache()):
+            if error is not None:
+                failures.append((name, error))
+            else:
+                store.add(PurePosixPath(name).name, result)
+            progress.progress(done / total)
+    return store, failures
+
+def zip_batch(uploaded_zip):
+    """Process each upload once per session; reruns (e.g. the download click) reuse its store."""
+    key = getattr(uploaded_zip, "file_id", uploaded_zip.name)
+    batch = st.session_state.get("zip_batch")
+    if batch is None or batch["key"] != key:
+        if batch is not None:
+            del st.session_state["zip_batch"]
+            batch["store"].cleanup()
+        store, failures = process_zip(uploaded_zip)
+        batch = st.session_state["zip_batch"] = {"key": key, "store": store, "failures": failures}
+    return batch["store"].zip_reader(), batch["failures"]
 
 # Streamlit UI
 st.title("📸 Image Compressor - Under 100KB")
@@ -90,6 +58,9 @@ if uploaded_file:
         st.success(f"✅ Compressed: {filename}")
         st.download_button("Download Compressed Image", data=compressed_img, file_name=filename)
     elif upload_type == "ZIP Folder":
-        zip_path = process_zip(uploaded_file)
-        with open(zip_path, "rb") as f:
-            st.download_button("Download Compressed ZIP", data=f, file_name="compressed_images.zip")
\ No newline at end of file
+        compressed_zip, failures = zip_batch(uploaded_file)
+        if failures:
+            with st.expander(f"⚠️ {len(failures)} file(s) could not be compressed"):
+                for name, error in failures:
+                    st.write(f"`{name}` — {error}")
+        st.download_button("Download Compressed ZIP", data=compressed_zip, file_name="compressed_images.zip")
\ No newline at end of file
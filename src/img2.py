@@ -1,11 +1,12 @@
 import streamlit as st
-from PIL import Image
 import io
-import os
-import zipfile
-import tempfile
-import shutil
+# Run as a script (streamlit run src/img2.py); the shared image modules live in the src package
+import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.image_cache import ImageCache
+from src.image_compression import AUTO, OUTPUT_FORMATS, compress_cached, compress_zip_members, output_name
+from src.result_store import ResultStore
 
 # --- UI Config ---
 st.set_page_config(page_title="Advanced Image Compressor", layout="centered")
@@ -24,127 +25,100 @@ if theme == "Dark":
 
 # --- Constants ---
 DEFAULT_MAX_KB = 500
-
-# --- Compression Function ---
-def compress_image(img, format, target_size_kb):
-    quality = 95
-    img_bytes = io.BytesIO()
-    original_size = img.size
-
-    if img.mode in ("RGBA", "P"):
-        img = img.convert("RGB")
-
-    while quality > 5:
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
-        size_kb = img_bytes.tell() / 1024
-        if size_kb <= target_size_kb:
-            break
-        quality -= 5
-
-    if size_kb > target_size_kb:
-        width, height = img.size
-        while size_kb > target_size_kb and width > 200 and height > 200:
-            width = int(width * 0.9)
-            height = int(height * 0.9)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='JPEG', quality=quality, optimize=True)
-            size_kb = img_bytes.tell() / 1024
-
-    img_bytes.seek(0)
-    return img_bytes, size_kb, img.size, original_size
+PAGE_SIZES = [25, 50, 100]
 
 # --- Single Image ---
-def process_single_image(uploaded_file, target_size_kb):
-    image = Image.open(uploaded_file)
-    format = image.format
-    compressed_bytes, compressed_size, compressed_dims, original_dims = compress_image(image, format, target_size_kb)
+@st.cache_resource
+def _image_cache():
+    return ImageCache()
+
+def process_single_image(uploaded_file, target_size_kb, output_format):
+    result = compress_cached(uploaded_file.getvalue(), uploaded_file.name, target_size_kb, _image_cache(), output_format)
     return {
-        "filename": uploaded_file.name,
-        "data": compressed_bytes,
+        "filename": output_name(uploaded_file.name, result["format"]),
+        "format": result["format"],
+        "candidates": result["candidates"],
+        "data": io.BytesIO(result["data"]),
         "original_size": uploaded_file.size / 1024,
-        "compressed_size": compressed_size,
-        "original_dims": original_dims,
-        "compressed_dims": compressed_dims
+        "compressed_size": result["compressed_size"],
+        "original_dims": result["original_dims"],
+        "compressed_dims": result["compressed_dims"]
     }
 
 # --- ZIP Image Folder ---
-def process_zip(uploaded_zip, target_size_kb):
-    temp_zip_file = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
-    individual_files = []
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        zip_path = os.path.join(temp_dir, "uploaded.zip")
-        with open(zip_path, "wb") as f:
-            f.write(uploaded_zip.read())
-
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-
-        output_dir = os.path.join(temp_dir, "compressed")
-        os.makedirs(output_dir, exist_ok=True)
-
-        all_files = []
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                if file.lower().endswith((".jpg", ".jpeg", ".png")):
-                    all_files.append(os.path.join(root, file))
-
-        progress = st.progress(0)
-        for i, full_path in enumerate(all_files):
-            try:
-                relative_path = os.path.relpath(full_path, temp_dir)
-                out_path = os.path.join(output_dir, relative_path)
-                os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-                img = Image.open(full_path)
-                format = img.format
-                compressed, size_kb, comp_dims, orig_dims = compress_image(img, format, target_size_kb)
-
-                with open(out_path, "wb") as f:
-                    f.write(compressed.read())
-
-                individual_files.append({
-                    "name": Path(relative_path).name,
-                    "data": compressed,
-                    "compressed_size": size_kb,
-                    "original_size": os.path.getsize(full_path) / 1024,
-                    "original_dims": orig_dims,
-                    "compressed_dims": comp_dims
-                })
-
-            except Exception as e:
-                print(f"Error compressing {full_path}: {e}")
-
-            progress.progress((i + 1) / len(all_files))
-
-        shutil.make_archive(temp_zip_file.name.replace(".zip", ""), 'zip', output_dir)
-        return temp_zip_file.name, individual_files
+def process_zip(uploaded_zip, target_size_kb, output_format):
+    """Compress into a disk-backed ResultStore; memory stays flat however large the archive."""
+    store = ResultStore()
+    failures = []
+
+    progress = st.progress(0)
+    with store:
+        for relative_path, result, error, done, total in compress_zip_members(uploaded_zip, target_size_kb, cache=_image_cache(),
+                                                                                output_format=output_format):
+            if error is not None:
+                failures.append((relative_path, error))
+            else:
+                store.add(relative_path, result)
+            progress.progress(done / total)
+    return store, failures
+
+def zip_batch(uploaded_zip, target_size_kb, output_format):
+    """Process each (upload, target, format) once per session; reruns for paging reuse the store."""
+    key = (getattr(uploaded_zip, "file_id", uploaded_zip.name), target_size_kb, output_format)
+    batch = st.session_state.get("zip_batch")
+    if batch is None or batch["key"] != key:
+        if batch is not None:
+            # Forget the old batch before processing, so a failure below can't leave a cleaned-up store behind
+            del st.session_state["zip_batch"]
+            batch["store"].cleanup()
+        store, failures = process_zip(uploaded_zip, target_size_kb, output_format)
+        batch = st.session_state["zip_batch"] = {"key": key, "store": store, "failures": failures}
+    return batch["store"], batch["failures"]
 
 # --- UI ---
 st.title("📸 Advanced Image Compressor - Under Custom KB")
 upload_type = st.selectbox("Upload Type", ["Single Image", "ZIP Folder"])
 target_kb = st.slider("Target Image Size (KB)", 20, 1000, DEFAULT_MAX_KB)
+format_label = st.selectbox("Output Format", ["Auto (best quality)"] + list(OUTPUT_FORMATS),
+                            help="Auto keeps the format that looks closest to the original within the target. "
+                                 "JPEG drops transparency (flattened onto white).")
+output_format = AUTO if format_label.startswith("Auto") else format_label
 
 uploaded_file = st.file_uploader("Upload File", type=['jpg', 'jpeg', 'png', 'zip'], label_visibility="visible")
 
 # --- Processing ---
 if uploaded_file:
     if upload_type == "Single Image":
-        result = process_single_image(uploaded_file, target_kb)
-        st.success(f"✅ Compressed: {result['filename']}")
+        result = process_single_image(uploaded_file, target_kb, output_format)
+        st.success(f"✅ Compressed: {result['filename']} ({result['format']})")
         st.write(f"📏 **Dimensions**: {result['original_dims']} → {result['compressed_dims']}")
         st.write(f"📦 **Size**: {result['original_size']:.1f} KB → {result['compressed_size']:.1f} KB")
+        if result['candidates']:
+            st.write("🔎 **Per format**: " + ", ".join(f"{fmt} {kb:.1f} KB" for fmt, kb in result['candidates'].items()))
         st.download_button("Download Compressed Image", data=result['data'], file_name=result['filename'])
     else:
-        zip_path, files_info = process_zip(uploaded_file, target_kb)
-        st.success(f"✅ {len(files_info)} images compressed")
-
-        with open(zip_path, "rb") as f:
-            st.download_button("Download All as ZIP", data=f, file_name="compressed_images.zip")
+        store, failures = zip_batch(uploaded_file, target_kb, output_format)
+        summary = store.summary()
+        st.success(f"✅ {summary['files']} images compressed")
+        st.write(f"📦 **Total**: {summary['original_kb'] / 1024:.1f} MB → {summary['compressed_kb'] / 1024:.1f} MB "
+                 f"({summary['saved_pct']:.0f}% saved)")
+        with st.expander("🗂️ Bytes saved per format"):
+            st.dataframe(store.format_report(), hide_index=True, use_container_width=True)
+        if failures:
+            with st.expander(f"⚠️ {len(failures)} file(s) could not be compressed"):
+                for name, error in failures:
+                    st.write(f"`{name}` — {error}")
+
+        st.download_button("Download All as ZIP", data=store.zip_reader(), file_name="compressed_images.zip")
 
         with st.expander("📂 Download Individual Files"):
-            for img in files_info:
-                st.write(f"📸 `{img['name']}` — {img['original_size']:.1f} KB → {img['compressed_size']:.1f} KB")
-                st.download_button(f"Download {img['name']}", data=img['data'], file_name=img['name'])
\ No newline at end of file
+            col1, col2 = st.columns(2)
+            page_size = col1.selectbox("Files per page", PAGE_SIZES, index=1)
+            pages = max(1, -(-len(store) // page_size))
+            page = col2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            rows = store.page(page, page_size)
+            st.dataframe([{k: v for k, v in row.items() if k != "Path"} for row in rows],
+                         hide_index=True, use_container_width=True)
+            for row in rows:
+                st.download_button(f"Download {row['File']}", data=store.reader(row["Path"]),
+                                   file_name=row["File"], key=f"dl_{row['Path']}")
@@ -0,0 +1,148 @@
+# visionverse_dashboard/src/job_lineage.py
+import numpy as np
+import pandas as pd
+from . import data_store
+from .profiler import span
+
+# One row per job linking the maker log (Job ID), the editor log (Editing Job ID)
+# and quality reviews (Job ID), indexed by the normalized job id.
+MAKER_NAME_COLUMNS = ["Maker", "Annotator", "Name"]
+EDITOR_NAME_COLUMNS = ["Editor", "Name"]
+STAGES = {"Maker": "maker_end", "Editor": "edit_end", "Quality": "quality_date"}
+
+
+def normalize_job_id(values: pd.Series) -> pd.Series:
+    # Whole-number ids that arrived as floats (123.0) compare as 123, like the text logs
+    if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+        values = values.astype("Int64")
+    return values.astype("string").str.strip().str.upper()
+
+
+def _first_present(df, columns):
+    return next((c for c in columns if c in df.columns), None)
+
+
+def _is_rework(status):
+    return status.astype("string").str.contains("rework", case=False, na=False)
+
+
+def _stage(df, id_col, name_cols, prefix, name_as):
+    """Collapse one log to a row per job: name, first start, last end, pass count and rework flag."""
+    if df is None or df.empty or id_col not in df.columns:
+        return pd.DataFrame(index=pd.Index([], name="job", dtype="string"))
+    name_col = _first_present(df, name_cols)
+    frame = pd.DataFrame({
+        "job": normalize_job_id(df[id_col]),
+        "name": df[name_col].astype("string").str.strip() if name_col else pd.NA,
+        "start": df["Start date"] if "Start date" in df.columns else pd.NaT,
+        "end": df["End date"] if "End date" in df.columns else pd.NaT,
+        "rework": _is_rework(df["Status"]) if "Status" in df.columns else False,
+        "status": df["Status"].astype("string") if "Status" in df.columns else pd.NA,
+    }).dropna(subset=["job"])
+    g = frame.groupby("job", sort=False)
+    out = pd.DataFrame({
+        name_as: g["name"].last(),
+        f"{prefix}_start": g["start"].min(),
+        f"{prefix}_end": g["end"].max(),
+        f"{prefix}_passes": g.size(),
+        f"{prefix}_rework": g["rework"].sum(),
+        f"{prefix}_status": g["status"].last(),
+    })
+    out.index.name = "job"
+    return out
+
+
+def _quality_stage(quality_df):
+    if quality_df is None or quality_df.empty or "Job ID" not in quality_df.columns:
+        return pd.DataFrame(index=pd.Index([], name="job", dtype="string"))
+    dates = pd.to_datetime(quality_df["Date"], errors="coerce", dayfirst=True) if "Date" in quality_df.columns else pd.NaT
+    frame = pd.DataFrame({
+        "job": normalize_job_id(quality_df["Job ID"]),
+        "reviewee": quality_df["Rename"].astype("string").str.strip() if "Rename" in quality_df.columns else pd.NA,
+        "date": dates,
+    }).dropna(subset=["job"])
+    g = frame.groupby("job", sort=False)
+    out = pd.DataFrame({
+        "quality_reviewee": g["reviewee"].last(),
+        "quality_reviews": g.size(),
+        "quality_date": g["date"].max(),
+    })
+    out.index.name = "job"
+    return out
+
+
+def build_lineage(maker_df, editor_df, quality_df=None):
+    """Outer-join the three stages on job id and derive turnaround and rework.
+
+    Returns {"jobs": DataFrame indexed by job id (sorted), "by_person": {name: row positions}}.
+    """
+    maker = _stage(maker_df, "Job ID", MAKER_NAME_COLUMNS, "maker", "maker")
+    editor = _stage(editor_df, "Editing Job ID", EDITOR_NAME_COLUMNS, "edit", "editor")
+    quality = _quality_stage(quality_df)
+    jobs = maker.join(editor, how="outer").join(quality, how="outer").sort_index()
+
+    def col(name, default=pd.NaT):
+        return jobs[name] if name in jobs.columns else pd.Series(default, index=jobs.index)
+
+    finished = col("edit_end").fillna(col("maker_end"))
+    jobs["turnaround_days"] = (finished - col("maker_start")) / pd.Timedelta(days=1)
+    jobs["edit_wait_days"] = (col("edit_start") - col("maker_end")) / pd.Timedelta(days=1)
+    jobs["rework_count"] = (
+        (col("maker_passes", 0).fillna(0) - 1).clip(lower=0)
+        + (col("edit_passes", 0).fillna(0) - 1).clip(lower=0)
+        + col("maker_rework", 0).fillna(0)
+        + col("edit_rework", 0).fillna(0)
+    ).astype(int)
+    jobs["reworked"] = jobs["rework_count"] > 0
+
+    # Positional index per person, for any role they played on a job
+    by_person = {}
+    for role in ("maker", "editor", "quality_reviewee"):
+        if role in jobs.columns:
+            for name, idx in jobs.groupby(role, sort=False).indices.items():
+                by_person.setdefault(name, []).append(idx)
+    by_person = {name: np.unique(np.concatenate(parts)) for name, parts in by_person.items()}
+    return {"jobs": jobs, "by_person": by_person}
+
+
+def lineage_for(maker_df, editor_df, quality_df=None):
+    """Shared lineage for this combination of inputs, built once per data version."""
+    # One slot per input, so a missing frame can't shift another into its place
+    version = "-".join("none" if f is None else data_store.data_version(f) for f in (maker_df, editor_df, quality_df))
+    with span("job_lineage.build"):
+        return data_store.get("job_lineage", version, lambda: build_lineage(maker_df, editor_df, quality_df))
+
+
+def job(lineage, job_id):
+    """Lineage row for one job id (any casing/whitespace), or None."""
+    key = str(job_id).strip().upper()
+    jobs = lineage["jobs"]
+    return jobs.loc[key] if key in jobs.index else None
+
+
+def person_jobs(lineage, name):
+    """Every job the person made, edited or was reviewed on."""
+    positions = lineage["by_person"].get(name)
+    return lineage["jobs"].iloc[positions if positions is not None else []]
+
+
+def stage_throughput(lineage, freq="D"):
+    """Jobs completed per stage per period (maker end, editor end, quality review date)."""
+    jobs = lineage["jobs"]
+    series = {
+        stage: jobs[col].dropna().dt.to_period(freq).value_counts()
+        for stage, col in STAGES.items() if col in jobs.columns
+    }
+    out = pd.DataFrame(series).fillna(0).astype(int).sort_index()
+    out.index = out.index.to_timestamp()
+    return out
+
+
+def summary(lineage):
+    jobs = lineage["jobs"]
+    return {
+        "jobs": len(jobs),
+        "median_turnaround_days": jobs["turnaround_days"].median(),
+        "median_edit_wait_days": jobs["edit_wait_days"].median(),
+        "rework_rate": jobs["reworked"].mean() if len(jobs) else 0.0,
+    }
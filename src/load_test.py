@@ -0,0 +1,148 @@
+# visionverse_dashboard/src/load_test.py
+"""Concurrent-session load test for the dashboard.
+
+Simulates N sessions that each switch pages and change sidebar widgets, against
+the local Google Sheets emulator (src/sheets_emulator.py), and reports throughput,
+rerun latency percentiles and peak memory.
+
+    python -m src.load_test --sessions 20 --reruns 15
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# Share of reruns that navigate to another page; the rest change a sidebar widget on the current page
+PAGE_SWITCH_PROBABILITY = 0.3
+
+
+def _change_random_widget(at, rng):
+    """Pick one sidebar selectbox/radio (other than page navigation) and set a random option."""
+    candidates = [w for w in list(at.sidebar.selectbox) + list(at.sidebar.radio)[1:] if len(w.options) > 1]
+    if not candidates:
+        return None
+    widget = rng.choice(candidates)
+    widget.set_value(rng.choice(list(widget.options)))
+    return widget.label
+
+
+def _run_session(session_id, reruns, seed, timeout, samples, errors, page_switch=PAGE_SWITCH_PROBABILITY):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    samples.append(("(initial)", time.perf_counter() - start))
+    # Pages as the app's own navigation radio lists them
+    pages = list(at.sidebar.radio[0].options)
+
+    for _ in range(reruns):
+        page = at.sidebar.radio[0].value
+        try:
+            if rng.random() < page_switch or _change_random_widget(at, rng) is None:
+                page = rng.choice([p for p in pages if p != page] or pages)
+                at.sidebar.radio[0].set_value(page)
+            start = time.perf_counter()
+            at.run()
+            samples.append((at.sidebar.radio[0].value, time.perf_counter() - start))
+            if at.exception:
+                errors.append((session_id, at.sidebar.radio[0].value, at.exception[0].value))
+        except Exception as e:
+            errors.append((session_id, page, repr(e)))
+
+
+def run_load_test(sessions=10, reruns=10, seed=0, timeout=120, quality_rows=200, trace_memory=False,
+                  recordings_dir=None, faults=None, page_switch=PAGE_SWITCH_PROBABILITY):
+    from .sheets_emulator import SheetsEmulator, seed_recordings, team_url
+
+    tmp = None
+    if recordings_dir is None:
+        tmp = tempfile.TemporaryDirectory()
+        recordings_dir = seed_recordings(tmp.name, quality_rows, seed)
+    emulator = SheetsEmulator(recordings_dir, faults, seed=seed).start()
+    os.environ["GOOGLE_SHEET_URL"] = team_url(emulator.base_url)
+    os.environ["QUALITY_SHEET_BASE_URL"] = emulator.base_url
+
+    if trace_memory:
+        tracemalloc.start()
+    samples, errors = [], []
+    threads = [
+        threading.Thread(target=_run_session, args=(i, reruns, seed, timeout, samples, errors, page_switch))
+        for i in range(sessions)
+    ]
+    wall_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    emulator.stop()
+    if tmp is not None:
+        tmp.cleanup()
+
+    lat = pd.DataFrame(samples, columns=["Page", "Seconds"])
+    pct = lambda s: {f"p{q}": float(np.percentile(s, q)) * 1000 for q in (50, 95, 99)}
+    return {
+        "sessions": sessions,
+        "reruns": len(lat),
+        "wall_s": wall,
+        "throughput_rps": len(lat) / wall if wall else 0.0,
+        "latency_ms": pct(lat["Seconds"]) if not lat.empty else {},
+        "latency_ms_by_page": {p: pct(g["Seconds"]) for p, g in lat.groupby("Page")},
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_traced_mb": traced_peak / (1024 * 1024) if traced_peak is not None else None,
+        "sheet_requests": emulator.stats,
+        "errors": [list(map(str, e)) for e in errors],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard.")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=10, help="widget-driven reruns per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--quality-rows", type=int, default=200, help="rows per synthetic quality sheet")
+    parser.add_argument("--recordings", help="emulator recordings directory (default: synthetic)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="latency injected by the emulator")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of sheet requests failing with 5xx")
+    parser.add_argument("--page-switch", type=float, default=PAGE_SWITCH_PROBABILITY,
+                        help="probability that a rerun switches page instead of changing a widget")
+    parser.add_argument("--trace-memory", action="store_true", help="also report tracemalloc peak (slower)")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, args.reruns, args.seed, args.timeout,
+                           args.quality_rows, args.trace_memory, args.recordings,
+                           {"latency_ms": args.latency_ms, "fail_rate": args.fail_rate}, args.page_switch)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    print(f"{report['sessions']} sessions, {report['reruns']} reruns in {report['wall_s']:.1f}s "
+          f"→ {report['throughput_rps']:.2f} reruns/s")
+    print("latency ms: " + ", ".join(f"{k}={v:.0f}" for k, v in report["latency_ms"].items()))
+    for page, p in sorted(report["latency_ms_by_page"].items()):
+        print(f"  {page:<22} " + ", ".join(f"{k}={v:.0f}" for k, v in p.items()))
+    print(f"peak RSS: {report['peak_rss_mb']:.0f} MB"
+          + (f", peak traced: {report['peak_traced_mb']:.0f} MB" if report["peak_traced_mb"] is not None else ""))
+    if report["errors"]:
+        print(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# visionverse_dashboard/src/memory_monitor.py
+import threading
+import tracemalloc
+
+import pandas as pd
+import streamlit as st
+
+from . import data_store
+
+_ENABLED_KEY = "_memory_monitor_enabled"
+_FRAMES_KEY = "_memory_monitor_frames"
+_BASELINE_KEY = "_memory_monitor_baseline"
+_TOP_ALLOCATORS = 15
+
+_FALLBACK_STATE = {}
+
+# tracemalloc is process-wide: it runs while at least one session has the panel open
+_TRACING_LOCK = threading.Lock()
+_TRACING_SESSIONS = set()
+
+
+def _state():
+    try:
+        return st.session_state
+    except Exception:
+        return _FALLBACK_STATE
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except Exception:
+        ctx = None
+    return ctx.session_id if ctx is not None else "local"
+
+
+def begin_rerun(enabled):
+    """Reset per-rerun frame accounting; trace allocations while any session shows the panel.
+
+    Sessions never clear the shared traces; each keeps its own baseline snapshot and
+    the allocator table shows growth since the start of its rerun.
+    """
+    state = _state()
+    state[_ENABLED_KEY] = bool(enabled)
+    state[_FRAMES_KEY] = {}
+    session = _session_id()
+    with _TRACING_LOCK:
+        if enabled:
+            _TRACING_SESSIONS.add(session)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        elif session in _TRACING_SESSIONS:
+            _TRACING_SESSIONS.discard(session)
+            if not _TRACING_SESSIONS and tracemalloc.is_tracing():
+                tracemalloc.stop()
+    state[_BASELINE_KEY] = _snapshot() if enabled else None
+
+
+def track_frame(name, df):
+    """Record the deep size of a derived frame (no-op unless the panel is enabled)."""
+    state = _state()
+    if not state.get(_ENABLED_KEY) or df is None:
+        return
+    state[_FRAMES_KEY][name] = {"rows": len(df), "bytes": data_store.deep_size(df)}
+
+
+def session_overhead():
+    """Deep size of every value held in this session's state."""
+    state = _state()
+    rows = []
+    for key in list(state.keys()):
+        if key in (_FRAMES_KEY, _ENABLED_KEY, _BASELINE_KEY):
+            continue
+        try:
+            size = data_store.deep_size(state[key])
+        except Exception:
+            continue
+        rows.append({"Key": str(key), "MB": size / (1024 * 1024)})
+    return pd.DataFrame(rows, columns=["Key", "MB"]).sort_values("MB", ascending=False)
+
+
+def _snapshot():
+    if not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+
+
+def top_allocators(limit=_TOP_ALLOCATORS):
+    """Largest allocation growth since this session's rerun began."""
+    snapshot, baseline = _snapshot(), _state().get(_BASELINE_KEY)
+    if snapshot is None:
+        return pd.DataFrame(columns=["Location", "MB", "Blocks"])
+    stats = snapshot.compare_to(baseline, "lineno") if baseline is not None else snapshot.statistics("lineno")
+    stats = sorted(stats, key=lambda s: getattr(s, "size_diff", s.size), reverse=True)[:limit]
+    return pd.DataFrame([{
+        "Location": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+        "MB": getattr(s, "size_diff", s.size) / (1024 * 1024),
+        "Blocks": getattr(s, "count_diff", s.count),
+    } for s in stats], columns=["Location", "MB", "Blocks"])
+
+
+def render_memory_panel():
+    """Debug sidebar panel: cached datasets, derived frames, session state and allocators."""
+    with st.sidebar.expander("🧠 Memory", expanded=True):
+        cached = data_store.entries()
+        budget = data_store.memory_budget_mb()
+        # Process-wide, so it comes from settings (MEMORY_BUDGET_MB), not from any one viewer
+        st.caption(f"Shared cache: **{cached['MB'].sum():.1f} MB** of {budget:.0f} MB budget (MEMORY_BUDGET_MB)")
+        st.dataframe(cached.style.format({"MB": "{:.2f}"}), hide_index=True)
+
+        frames = _state().get(_FRAMES_KEY) or {}
+        st.markdown("**Derived frames (this rerun)**")
+        frames_df = pd.DataFrame([
+            {"Frame": k, "Rows": v["rows"], "MB": v["bytes"] / (1024 * 1024)} for k, v in frames.items()
+        ], columns=["Frame", "Rows", "MB"])
+        st.dataframe(frames_df.style.format({"MB": "{:.2f}"}), hide_index=True)
+
+        overhead = session_overhead()
+        st.markdown(f"**Session state: {overhead['MB'].sum():.2f} MB**")
+        st.dataframe(overhead.head(10).style.format({"MB": "{:.3f}"}), hide_index=True)
+
+        st.markdown("**Top allocators (this rerun)**")
+        st.dataframe(top_allocators().style.format({"MB": "{:.3f}"}), hide_index=True)
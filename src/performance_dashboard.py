@@ -3,14 +3,20 @@ import pandas as pd
 import altair as alt
 import numpy as np
 import calendar
-
-# Constants (change if needed)
-MAKER_TARGET_DAILY = 750
-EDITOR_TARGET_DAILY = 1500
+from .profiler import span, timed
+from .memory_monitor import track_frame
+from .forecast import forecast_for, risk_ranking, HISTORY_DAYS
+from .quality_dataset import load_quality_dataset
+from .targets import period_targets, resolve as resolve_targets, role_targets
+from .throughput_facts import attainment, facts_for, slice_facts
+from .work_calendar import PERIOD_WEEKMASKS, availability, person_days, working_days
+
+# Constants (change if needed); daily targets live in data/targets.csv
 MAKERS_COUNT = 20        # configured team size
 EDITORS_COUNT = 10       # configured team size
 
 # ---------------- Utility functions ----------------
+@timed("performance._parse_dates")
 def _parse_dates(df):
     """Ensure Date_dt exists and normalized."""
     df = df.copy()
@@ -46,55 +52,25 @@ def _parse_dates(df):
     df['Date_dt'] = df['Date_dt'].dt.normalize()
     return df
 
-def _daily_target_for_role(role):
-    return MAKER_TARGET_DAILY if role == 'Maker' else EDITOR_TARGET_DAILY
-
-def _business_days_mon_fri(start, end):
-    """Count Mon-Fri inclusive between start and end (business days)."""
-    if pd.isna(start) or pd.isna(end):
-        return 0
-    rng = pd.bdate_range(start, end)
-    return len(rng)
-
-def _working_days_excluding_sunday(start, end):
-    """Count all days except Sundays between start and end (inclusive)."""
-    if pd.isna(start) or pd.isna(end):
-        return 0
-    rng = pd.date_range(start, end, freq='D')
-    return int((rng.weekday != 6).sum())
-
 def _aggregate_for_period(df_period, by='Rename'):
     return df_period.groupby(by)['Cuboids'].sum().reset_index().rename(columns={'Cuboids': 'Total Cuboids'})
 
+@timed("performance._compute_streaks")
 def _compute_streaks(df):
-    """Longest consecutive days where annotator met daily target."""
-    results = {}
-    for annot in df['Rename'].unique():
-        a_df = df[df['Rename'] == annot].sort_values('Date_dt')
-        if a_df.empty:
-            results[annot] = 0
-            continue
-        
-        role_val = a_df['Role'].iloc[0] if 'Role' in a_df.columns else 'Maker'
-        target = _daily_target_for_role(role_val)
-        
-        day_sum = a_df.groupby('Date_dt')['Cuboids'].sum().reindex(
-            pd.date_range(a_df['Date_dt'].min(), a_df['Date_dt'].max()),
-            fill_value=0
-        )
-        
-        max_streak = streak = 0
-        for v in day_sum:
-            if v >= target:
-                streak += 1
-                max_streak = max(max_streak, streak)
-            else:
-                streak = 0
-        results[annot] = max_streak
-    return results
+    """Longest run of consecutive calendar days where each annotator met that day's target."""
+    roles = df['Role'] if 'Role' in df.columns else 'Maker'
+    first_role = df.assign(Role=roles).sort_values('Date_dt', kind='stable').groupby('Rename')['Role'].first()
+    daily = df.groupby(['Rename', 'Date_dt'], sort=True)['Cuboids'].sum().reset_index()
+    daily['Target'] = resolve_targets(daily['Date_dt'], daily['Rename'].map(first_role), daily['Rename'])['Daily Target']
+    met = daily[daily['Cuboids'] >= daily['Target']]
+    # A run breaks on a new annotator or a gap of more than one day (missing days count as 0)
+    new_run = (met['Rename'] != met['Rename'].shift()) | (met['Date_dt'].diff() != pd.Timedelta(days=1))
+    runs = met.groupby([met['Rename'], new_run.cumsum()]).size()
+    longest = runs.groupby(level=0).max() if not runs.empty else pd.Series(dtype='int64')
+    return longest.reindex(df['Rename'].unique(), fill_value=0).astype(int).to_dict()
 
 # ---------------- Dashboard ----------------
-def render_dashboard(df):
+def render_dashboard(df, data_version=None):
     """
     df expected columns: Name, Rename, Date, Cuboids, Role
     - Rename: annotator display name
@@ -108,6 +84,12 @@ def render_dashboard(df):
         st.warning("No data provided to performance dashboard.")
         return
 
+    # Shared per-version results (forecast, fact table) use the unparsed frame, which is
+    # what data_version hashes; unreadable dates are dropped there rather than set to today
+    source = df
+    with span("performance.forecast"):
+        forecast = forecast_for(source, data_version)
+
     # Normalize input and basic checks
     df = df.copy()
     df = _parse_dates(df)
@@ -136,7 +118,6 @@ def render_dashboard(df):
                                     min_value=available_dates[0] if available_dates else None,
                                     max_value=available_dates[-1] if available_dates else None)
             start_date = end_date = pd.Timestamp(sel_date).normalize()
-            period_multiplier = 1
             period_label = f"{start_date.date()}"
 
         elif view_period == "Weekly":
@@ -161,7 +142,6 @@ def render_dashboard(df):
             sel_idx = st.selectbox("Select Week", opt_labels, index=len(opt_labels)-1)
             chosen = opts[opt_labels.index(sel_idx)]
             start_date, end_date = chosen[2], chosen[3]
-            period_multiplier = 5
             period_label = f"{start_date.date()} → {end_date.date()}"
 
         else: # Monthly
@@ -184,15 +164,22 @@ def render_dashboard(df):
             sel_idx = st.selectbox("Select Month", opt_labels, index=len(opt_labels)-1)
             chosen = opts[opt_labels.index(sel_idx)]
             start_date, end_date = chosen[2], chosen[3]
-            period_multiplier = _working_days_excluding_sunday(start_date, end_date)
             period_label = f"{calendar.month_name[chosen[1]]} {chosen[0]}"
 
+        # Working days of the period: the view's working week minus holidays
+        weekmask = PERIOD_WEEKMASKS[view_period]
+        period_days = working_days(start_date, end_date, weekmask)
+        period_multiplier = len(period_days)
+
         top_filter = st.selectbox("Show", ["All", "Top Performers", "Low Performers"])
         selected_person = st.selectbox("Select person (Personal tracker)", ["(none)"] + sorted(df['Rename'].unique()))
         
         st.markdown("---")
-        st.write(f"Per-head daily targets: Maker = **{MAKER_TARGET_DAILY}**, Editor = **{EDITOR_TARGET_DAILY}**")
-        st.caption("Targets use multipliers: Daily×1, Weekly×5, Monthly=(days in selected month excluding Sundays).")
+        current = role_targets(end_date).set_index('Role')['Daily Target']
+        st.write(f"Per-head daily targets: Maker = **{current['Maker']:,.0f}**, Editor = **{current['Editor']:,.0f}**")
+        st.caption("Period targets add up each working day's target (Daily×1, Weekly Mon–Fri, "
+                   "Monthly = days in selected month excluding Sundays), as set in data/targets.csv on that day. "
+                   "Holidays (data/holidays.csv) and each person's leave (data/leave.csv) carry no target.")
 
     # Filter by role
     df_view = df if role_filter == "All" else df[df['Role'] == role_filter].copy()
@@ -200,21 +187,28 @@ def render_dashboard(df):
     # Filter timeframe
     mask = (df_view['Date_dt'] >= pd.to_datetime(start_date)) & (df_view['Date_dt'] <= pd.to_datetime(end_date))
     df_period = df_view.loc[mask].copy()
+    track_frame("performance.df", df)
+    track_frame("performance.df_period", df_period)
 
     if df_period.empty:
         st.warning(f"No records for selected period: {period_label}")
         return
 
     # Per-person aggregation
-    agg = _aggregate_for_period(df_period, by='Rename')
-    role_map = df_period.groupby('Rename')['Role'].first().reset_index()
-    agg = agg.merge(role_map, on='Rename', how='left').rename(columns={'Rename':'Annotator', 'Role':'Role'})
-
-    # Period targets using fixed multipliers
-    agg['Daily Target'] = agg['Role'].apply(_daily_target_for_role)
-    agg['Period Target'] = agg['Daily Target'] * period_multiplier
-    agg['Deficit'] = agg['Total Cuboids'] - agg['Period Target']
-    agg['Target Met'] = agg['Deficit'] >= 0
+    with span("performance.aggregate"):
+        agg = _aggregate_for_period(df_period, by='Rename')
+        role_map = df_period.groupby('Rename')['Role'].first().reset_index()
+        agg = agg.merge(role_map, on='Rename', how='left').rename(columns={'Rename':'Annotator', 'Role':'Role'})
+
+        # Period targets: the target in force on each of the person's working days
+        today = pd.Timestamp.today().normalize()
+        days = person_days(agg['Annotator'], start_date, end_date, weekmask, as_of=today)
+        agg['Working Days'] = days['Working days'].to_numpy()
+        agg['Days Remaining'] = days['Days remaining'].to_numpy()
+        agg['Period Target'] = period_targets(agg['Annotator'], agg['Role'], period_days,
+                                              available=availability(agg['Annotator'], period_days))
+        agg['Deficit'] = agg['Total Cuboids'] - agg['Period Target']
+        agg['Target Met'] = agg['Deficit'] >= 0
 
     # Save full-aggregation BEFORE applying top/low filter (used to compute totals correctly)
     agg_full = agg.copy()
@@ -249,21 +243,21 @@ def render_dashboard(df):
         color=alt.condition(alt.datum['Target Met'] == True, alt.value('#2ca02c'), alt.value('#d62728')),
         tooltip=['Annotator','Role','Total Cuboids','Period Target','Deficit']
     ).properties(height=420)
-    st.altair_chart(bar, use_container_width=True)
+    with span("performance.chart.production"):
+        st.altair_chart(bar, use_container_width=True)
 
     # ---------------- Detailed Table with TOTAL row ----------------
     st.markdown("### 📋 Detailed Table")
     display_df = agg[['Annotator','Role','Total Cuboids','Period Target','Deficit','Target Met']].copy()
     
     total_cuboids_team = int(agg_full['Total Cuboids'].sum()) if not agg_full.empty else 0
+    maker_head, editor_head = period_targets(None, ['Maker', 'Editor'], period_days)
     if role_filter == "All":
-        base_target = (MAKERS_COUNT * MAKER_TARGET_DAILY) + (EDITORS_COUNT * EDITOR_TARGET_DAILY)
+        team_period_target = (MAKERS_COUNT * maker_head) + (EDITORS_COUNT * editor_head)
     elif role_filter == "Maker":
-        base_target = MAKERS_COUNT * MAKER_TARGET_DAILY
+        team_period_target = MAKERS_COUNT * maker_head
     else:
-        base_target = EDITORS_COUNT * EDITOR_TARGET_DAILY
-    
-    team_period_target = base_target * period_multiplier
+        team_period_target = EDITORS_COUNT * editor_head
     target_met_count = int((agg_full['Deficit'] >= 0).sum()) if not agg_full.empty else 0
     annotator_count_all = int(len(agg_full)) if not agg_full.empty else 0
     
@@ -292,27 +286,40 @@ def render_dashboard(df):
               .apply(highlight_total, axis=1)
               .map(color_deficit, subset=['Deficit'])
               .format({'Total Cuboids':'{:,}','Period Target':'{:,}','Deficit':'{:+,}'}))
-    st.dataframe(styled)
+    with span("performance.table.detailed"):
+        st.dataframe(styled)
 
     # ---------------- Compensation Planner ----------------
     st.markdown("### ⚖️ Compensation Planner")
-    today = pd.Timestamp.today().normalize()
-    if view_period == "Monthly":
-        days_passed = _working_days_excluding_sunday(start_date, min(today, end_date))
-    else:
-        days_passed = _business_days_mon_fri(start_date, min(today, end_date))
-    remaining_days = max(period_multiplier - days_passed, 0)
-    
+    remaining_days = int((period_days > today).sum())
+
     if remaining_days <= 0:
         st.info("No remaining working days left in this target window (or period ended).")
     else:
         st.write(f"Remaining working days (for compensation): **{remaining_days}**")
         comp = display_df.copy()
-        comp['Remaining to meet'] = comp.apply(lambda r: max(r['Period Target'] - r['Total Cuboids'], 0), axis=1)
-        comp['Per-day required'] = (comp['Remaining to meet'] / remaining_days).apply(lambda x: int(np.ceil(x)) if x>0 else 0)
-        st.dataframe(comp[['Annotator','Role','Total Cuboids','Period Target','Remaining to meet','Per-day required']].style.format({
+        comp['Days Remaining'] = agg.loc[comp.index, 'Days Remaining']
+        comp['Remaining to meet'] = (comp['Period Target'] - comp['Total Cuboids']).clip(lower=0)
+        # Per person, over the days they are not on leave; blank when none are left
+        per_day = np.ceil(comp['Remaining to meet'] / comp['Days Remaining'].where(comp['Days Remaining'] > 0))
+        comp['Per-day required'] = per_day.where(comp['Remaining to meet'] > 0, 0).astype('Int64')
+        st.dataframe(comp[['Annotator','Role','Total Cuboids','Period Target','Remaining to meet','Days Remaining','Per-day required']].style.format({
             'Total Cuboids':'{:,}','Period Target':'{:,}','Remaining to meet':'{:,}'
-        }))
+        }, na_rep='—'))
+
+    # Risk ranking: where each annotator is likely to land by the end of the current week/month
+    horizon = "Month" if view_period == "Monthly" else "Week"
+    ranking = risk_ranking(forecast, horizon)
+    if role_filter != "All":
+        ranking = ranking[ranking['Role'] == role_filter]
+    if not ranking.empty:
+        period_end = pd.Timestamp(ranking['Period end'].iloc[0]).date()
+        st.markdown(f"#### 🔮 End-of-{horizon.lower()} forecast (to {period_end})")
+        st.dataframe(ranking.drop(columns=['Horizon', 'Period end']).rename(columns={'Rename': 'Annotator'}).style.format({
+            'Done':'{:,.0f}','Target':'{:,}','P10':'{:,.0f}','Projected':'{:,.0f}','P90':'{:,.0f}','P(hit target)':'{:.0%}'
+        }, na_rep='—'), hide_index=True)
+        st.caption(f"Each remaining working day is resampled from the annotator's last {HISTORY_DAYS} "
+                   "days of output; P10/P90 bound 80% of the simulated totals.")
 
     # ---------------- Performers ----------------
     st.markdown("### ⭐ Performers")
@@ -343,14 +350,15 @@ def render_dashboard(df):
                 y=alt.Y('Cuboids:Q', title='Cuboids'),
                 tooltip=['Date_dt','Cuboids']
             ).properties(height=300)
-            st.altair_chart(line, use_container_width=True)
+            with span("performance.chart.personal"):
+                st.altair_chart(line, use_container_width=True)
             
             streaks = _compute_streaks(df_view)
             st.info(f"🏅 {selected_person} — longest daily-target streak: **{streaks.get(selected_person,0)}** days")
             
             recent_total = p_agg[p_agg['Date_dt'] >= pd.to_datetime(start_date)]['Cuboids'].sum()
             person_role = df_view[df_view['Rename'] == selected_person]['Role'].iloc[0] if not df_view[df_view['Rename'] == selected_person].empty else 'Maker'
-            st.write(f"Total in period: **{int(recent_total):,}** | Period target: **{_daily_target_for_role(person_role) * period_multiplier:,}**")
+            st.write(f"Total in period: **{int(recent_total):,}** | Period target: **{period_targets([selected_person], [person_role], period_days, available=availability([selected_person], period_days)).iloc[0]:,}**")
     else:
         st.write("Select a person to view personal progress.")
 
@@ -382,3 +390,37 @@ def render_dashboard(df):
             'Total Cuboids':'{:,}','Period Target':'{:,}','Deficit':'{:+,}'
         }))
 
+    at_risk = risk_ranking(forecast, "Month")
+    if role_filter != "All":
+        at_risk = at_risk[at_risk['Role'] == role_filter]
+    at_risk = at_risk[at_risk['P(hit target)'] < 0.5]
+    if not at_risk.empty:
+        st.warning(f"{len(at_risk)} members are unlikely (<50%) to reach this month's target: "
+                   + ", ".join(f"{r['Rename']} ({r['P(hit target)']:.0%})" for _, r in at_risk.iterrows()))
+
+    # ---------------- Dual-Target Attainment ----------------
+    st.markdown("### 🎯 Dual-Target Attainment (volume × quality)")
+    if st.checkbox("Include quality scores", value=False, key="perf_dual_target"):
+        quality, quality_version = load_quality_dataset()
+        quality_df = quality["rows"]
+        if quality_df.empty:
+            st.warning("No quality data available.")
+        else:
+            with span("performance.aggregate.dual_target"):
+                facts = facts_for(source, quality_df, team_version=data_version, quality_version=quality_version)
+                period_facts = slice_facts(facts, start_date, end_date)
+                if role_filter != "All":
+                    period_facts = period_facts[period_facts['Role'] == role_filter]
+                dual = attainment(period_facts)
+            st.caption(" | ".join(f"{r['Role']}: {r['Daily Target']:,.0f}/day at ≥{r['Quality Target']:.0f}% quality"
+                                  for _, r in role_targets(end_date).iterrows()))
+            if dual.empty:
+                st.write("No annotator-days in this period.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Quality-adjusted output", f"{dual['Adjusted Cuboids'].sum():,.0f}")
+                col2.metric("Annotator-days with quality", f"{int(dual['Days with quality'].sum())} / {int(dual['Days'].sum())}")
+                col3.metric("Days meeting both targets", f"{int(dual['Both Met'].sum())}")
+                st.dataframe(dual.rename(columns={'Canonical': 'Annotator'}).style.format({
+                    'Cuboids': '{:,.0f}', 'Adjusted Cuboids': '{:,.0f}', 'Quality %': '{:.1f}', 'Dual-target %': '{:.0f}%'
+                }, na_rep='—'))
@@ -0,0 +1,147 @@
+# visionverse_dashboard/src/profiler.py
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+import altair as alt
+
+# Session-state keys used to keep spans for the current rerun only
+_SPANS_KEY = "_profiler_spans"
+_STACK_KEY = "_profiler_stack"
+_RERUN_KEY = "_profiler_rerun"
+
+# Optional JSON-lines sink (one line per rerun) for offline analysis
+PROFILER_LOG_ENV = "PROFILER_LOG"
+
+# Used when code runs outside a Streamlit session (load tests, scripts)
+_FALLBACK_STATE = {}
+
+
+def _state():
+    try:
+        return st.session_state
+    except Exception:
+        return _FALLBACK_STATE
+
+
+def begin_rerun(page=None):
+    """Reset collected spans at the top of every script run."""
+    state = _state()
+    state[_SPANS_KEY] = []
+    state[_STACK_KEY] = []
+    state[_RERUN_KEY] = {"page": page, "started": time.time(), "t0": time.perf_counter()}
+
+
+@contextmanager
+def span(name):
+    """Time a block and record it against the current rerun."""
+    state = _state()
+    if _RERUN_KEY not in state:
+        begin_rerun()
+    spans = state[_SPANS_KEY]
+    stack = state[_STACK_KEY]
+    start = time.perf_counter()
+    stack.append(name)
+    try:
+        yield
+    finally:
+        stack.pop()
+        end = time.perf_counter()
+        t0 = state[_RERUN_KEY]["t0"]
+        spans.append({
+            "name": name,
+            "parent": stack[-1] if stack else None,
+            "depth": len(stack),
+            "start_ms": (start - t0) * 1000,
+            "duration_ms": (end - start) * 1000,
+        })
+
+
+def timed(name=None):
+    """Decorator form of `span`."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def rerun_record():
+    """Spans of the current rerun as a JSON-serialisable dict."""
+    state = _state()
+    rerun = state.get(_RERUN_KEY) or {}
+    spans = list(state.get(_SPANS_KEY) or [])
+    return {
+        "page": rerun.get("page"),
+        "started": rerun.get("started"),
+        "total_ms": (time.perf_counter() - rerun["t0"]) * 1000 if rerun else 0.0,
+        "spans": sorted(spans, key=lambda s: s["start_ms"]),
+    }
+
+
+def to_jsonl(records):
+    return "\n".join(json.dumps(r) for r in records) + "\n"
+
+
+def end_rerun():
+    """Close the rerun: keep it in the session history and append to PROFILER_LOG if set."""
+    record = rerun_record()
+    state = _state()
+    history = state.setdefault("_profiler_history", [])
+    history.append(record)
+    del history[:-50]
+
+    log_path = os.getenv(PROFILER_LOG_ENV)
+    if log_path:
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+    return record
+
+
+def render_profiler_panel():
+    """Debug sidebar panel: waterfall of spans plus per-name totals."""
+    record = rerun_record()
+    spans = record["spans"]
+
+    with st.sidebar.expander("⏱️ Profiler", expanded=True):
+        st.caption(f"Rerun total: **{record['total_ms']:.0f} ms** — {len(spans)} spans")
+        if not spans:
+            st.write("No spans recorded in this rerun.")
+            return
+
+        spans_df = pd.DataFrame(spans)
+        spans_df["end_ms"] = spans_df["start_ms"] + spans_df["duration_ms"]
+        spans_df["label"] = spans_df["depth"].map(lambda d: "· " * d) + spans_df["name"]
+        waterfall = alt.Chart(spans_df).mark_bar().encode(
+            x=alt.X("start_ms:Q", title="ms since rerun start"),
+            x2="end_ms:Q",
+            y=alt.Y("label:N", sort=None, title=None),
+            color=alt.Color("depth:O", legend=None),
+            tooltip=["name", "parent", alt.Tooltip("duration_ms:Q", format=".1f")]
+        ).properties(height=max(120, 18 * len(spans_df)))
+        st.altair_chart(waterfall, use_container_width=True)
+
+        totals = (spans_df.groupby("name")["duration_ms"]
+                  .agg(["count", "sum", "max"]).reset_index()
+                  .rename(columns={"count": "Calls", "sum": "Total ms", "max": "Max ms"})
+                  .sort_values("Total ms", ascending=False))
+        st.dataframe(totals.style.format({"Total ms": "{:.1f}", "Max ms": "{:.1f}"}), hide_index=True)
+
+        history = _state().get("_profiler_history") or []
+        st.download_button(
+            "Download spans (JSON lines)",
+            data=to_jsonl(history + [record]),
+            file_name="profiler_spans.jsonl",
+            mime="application/json",
+        )
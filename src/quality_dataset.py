@@ -0,0 +1,100 @@
+# visionverse_dashboard/src/quality_dataset.py
+import pandas as pd
+from . import data_store, quality_dedup, quality_store, roster
+from .data_quality_loader import SHEET_GID_MAP, load_quality_data
+from .profiler import span, timed
+from .scoring_model import DEFAULT_MODEL, SCORE_MAP  # noqa: F401 (SCORE_MAP re-exported)
+
+EXCLUDED_NAMES = ["Select Names"]
+
+
+def fetch_all_sheets():
+    dfs = []
+    for sheet in SHEET_GID_MAP.keys():
+        df = load_quality_data(sheet_name=sheet)
+        if not df.empty:
+            df["Sheet"] = sheet
+            dfs.append(df)
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+
+@timed("quality.calc_quality")
+def calc_quality(df, model=DEFAULT_MODEL):
+    df = df.copy()
+    for col in ["Total Cuboids", "Missing Cuboids"]:
+        if col in df.columns: df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    df = model.score(df)
+    if "Date" in df.columns:
+        df["Date_dt"] = pd.to_datetime(df["Date"], errors="coerce", dayfirst=True)
+        today = pd.Timestamp.today().normalize()
+        valid_year = df["Date_dt"].notna() & df["Date_dt"].dt.year.between(2000, today.year + 1)
+        df.loc[~valid_year, "Date_dt"] = pd.NaT
+    return df
+
+
+def annotator_profiles(df: pd.DataFrame, model=DEFAULT_MODEL) -> pd.DataFrame:
+    """Per-annotator means, cuboid sums, weakest metrics, trend and decision in one grouped pass.
+
+    The trend is the least-squares slope of Quality % over submission date (points per
+    week), taken from grouped sums of x, x², y and xy rather than a per-person fit.
+    """
+    score_cols = [c for c in df.columns if c.endswith(" Score")]
+    mean_cols = ["Base Quality %", "Penalty %", "Quality %"] + score_cols
+    dated = df["Date_dt"].notna()
+    x = ((df["Date_dt"] - df["Date_dt"].min()) / pd.Timedelta(days=1)).where(dated)
+    y = df["Quality %"].where(dated)
+    work = pd.concat([
+        df[mean_cols + ["Total Cuboids", "Missing Cuboids"]],
+        pd.DataFrame({"_x": x, "_xx": x * x, "_y": y, "_xy": x * y}),
+    ], axis=1)
+    agg = work.groupby(df["Rename"]).agg(["sum", "count"])
+
+    profiles = pd.DataFrame(index=agg.index)
+    for col in mean_cols:
+        profiles[col] = agg[(col, "sum")] / agg[(col, "count")].where(agg[(col, "count")] > 0)
+    for col in ("Total Cuboids", "Missing Cuboids"):
+        total = agg[(col, "sum")]
+        profiles[col] = total.astype("int64") if (total % 1 == 0).all() else total
+
+    n = agg[("_x", "count")]
+    sx, sy, sxx, sxy = (agg[(c, "sum")] for c in ("_x", "_y", "_xx", "_xy"))
+    denom = n * sxx - sx * sx
+    profiles["Trend (pts/week)"] = ((n * sxy - sx * sy) / denom.where(denom > 0)) * 7
+
+    best = max(model.score_map.values())
+    weak = profiles[score_cols].lt(best) & profiles[score_cols].notna()
+    labels = pd.Series([c.replace(" Score", "") + ", " for c in score_cols], index=score_cols)
+    profiles["Weakest Areas"] = weak.dot(labels).str.rstrip(", ").replace("", "None")
+    profiles["Decision"] = model.grades(profiles["Quality %"].to_numpy())
+    return profiles.reset_index()
+
+
+def build_quality_dataset(raw: pd.DataFrame) -> dict:
+    """Cross-sheet duplicates resolved, scored (incrementally, via quality_store), placeholder rows
+    dropped, team and canonical name added.
+
+    Returns {"rows": df, "duplicates": per-sheet report, "profiles": annotator profiles}.
+    """
+    kept, duplicates = quality_dedup.apply_rule(raw)
+    scored = quality_store.refresh(kept, calc_quality, SHEET_GID_MAP.keys())
+    df = scored[scored["Rename"].notna() & ~scored["Rename"].isin(EXCLUDED_NAMES)].reset_index(drop=True)
+    names = roster.resolve(df["Rename"])
+    df["Team"] = names["Team"]
+    df["Canonical"] = names["Canonical"]
+    return {"rows": df, "duplicates": duplicates, "profiles": annotator_profiles(df)}
+
+
+def load_quality_dataset():
+    """Enriched quality dataset for every sheet, built once per data version and shared read-only.
+
+    Returns (dataset, version), where dataset is build_quality_dataset()'s dict of rows,
+    duplicates and profiles. Resolve it once per rerun and pass it along; each call fetches
+    and hashes the sheets again. Every frame is empty (and version None) when no sheet
+    could be loaded.
+    """
+    raw = fetch_all_sheets()
+    if raw.empty:
+        return {"rows": pd.DataFrame(), "duplicates": pd.DataFrame(), "profiles": pd.DataFrame()}, None
+    version = f"{data_store.data_version(raw)}:{quality_dedup.dedup_rule()}"
+    with span("quality_dataset.build"):
+        return data_store.get("quality_dataset", version, lambda: build_quality_dataset(raw)), version
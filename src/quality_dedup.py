@@ -0,0 +1,67 @@
+# visionverse_dashboard/src/quality_dedup.py
+import numpy as np
+import pandas as pd
+from .job_lineage import normalize_job_id
+from .settings import get_setting
+
+# A job is identified across the editor tabs by normalized Job ID + annotator.
+# Repeats are duplicates; repeats whose review fields differ are conflicting re-reviews.
+KEEP_LATEST = "keep-latest"
+KEEP_ALL = "keep-all"
+REVIEW_COLUMNS = ["Total Cuboids", "Missing Cuboids", "Geometry", "BL", "DI", "Status", "Visibility", "Class"]
+
+
+def dedup_rule():
+    rule = str(get_setting("QUALITY_DUPLICATES", default=KEEP_LATEST)).strip().lower()
+    return rule if rule in (KEEP_LATEST, KEEP_ALL) else KEEP_LATEST
+
+
+def dedup_index(raw: pd.DataFrame) -> pd.DataFrame:
+    """Hash index over (Job ID, annotator), one row per input row, in O(n).
+
+    Columns: 'key' (uint64), 'duplicate' (key seen more than once), 'conflict'
+    (its duplicates disagree on a review field) and 'latest' (the row keep-latest
+    keeps: newest submission date, later sheet/row on ties).
+    """
+    job = normalize_job_id(raw["Job ID"]).fillna("")
+    who = raw["Rename"].astype("string").str.strip().str.casefold().fillna("")
+    key = pd.util.hash_pandas_object(pd.DataFrame({"job": job, "who": who}), index=False).to_numpy()
+
+    review_cols = [c for c in REVIEW_COLUMNS if c in raw.columns]
+    content = pd.util.hash_pandas_object(raw[review_cols].astype("string"), index=False).to_numpy()
+
+    index = pd.DataFrame({"key": key, "content": content}, index=raw.index)
+    counts = index.groupby("key")["key"].transform("size")
+    variants = index.groupby("key")["content"].transform("nunique")
+
+    dates = pd.to_datetime(raw["Date"], errors="coerce", dayfirst=True) if "Date" in raw.columns else pd.Series(pd.NaT, index=raw.index)
+    order = np.lexsort((np.arange(len(raw)), dates.to_numpy().astype("datetime64[ns]").astype("int64")))
+    latest = np.zeros(len(raw), dtype=bool)
+    latest[order[~pd.Series(key[order]).duplicated(keep="last").to_numpy()]] = True
+
+    # Rows without a Job ID can't be matched to anything; never treat them as duplicates
+    no_id = (job == "").to_numpy()
+    return pd.DataFrame({
+        "key": key,
+        "duplicate": (counts.to_numpy() > 1) & ~no_id,
+        "conflict": (variants.to_numpy() > 1) & ~no_id,
+        "latest": latest | no_id,
+    }, index=raw.index)
+
+
+def apply_rule(raw: pd.DataFrame, rule=None):
+    """Returns (rows to keep, per-sheet duplicate report)."""
+    if raw.empty or "Job ID" not in raw.columns or "Rename" not in raw.columns:
+        return raw, pd.DataFrame(columns=["Sheet", "Rows", "Duplicate rows", "Conflicting rows", "Dropped"])
+    rule = rule or dedup_rule()
+    index = dedup_index(raw)
+    keep = index["latest"] if rule == KEEP_LATEST else pd.Series(True, index=raw.index)
+
+    report = pd.DataFrame({
+        "Sheet": raw["Sheet"],
+        "Rows": 1,
+        "Duplicate rows": index["duplicate"].astype(int),
+        "Conflicting rows": index["conflict"].astype(int),
+        "Dropped": (~keep).astype(int),
+    }).groupby("Sheet", sort=False).sum().reset_index()
+    return raw[keep.to_numpy()], report
@@ -1,71 +1,18 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from .data_quality_loader import SHEET_GID_MAP, load_quality_data
-
-RENAMES = [
-    "Thashvi (Amulya)", "Jyothi (Arpitha)", "Deepika (Chandana)", "Shilpa (Divya)", "Chandu M", "Shivukumar",
-    "Dhanushree", "Praveen (Babu M)", "Bhanushekar (AvinaShree)", "Abhinashree", "Nayana", "Kruthi",
-    "PriyaPragathi (Sushmitha S)", "Priyanka (Mokshashree CM)", "Sneha KM", "Mohammad", "Abhishek", "Nisarga",
-    "Aarohi", "Manu", "Mukund", "Sharath", "Ravi", "Nisha", "Madhushree", "Sowjanya", "Danny", "Sushma",
-    "Ramesh", "Nithin"
-]
-
-SCORE_MAP = {"Poor": 1, "Average": 2, "Good": 2.5, "Excellent": 3}
-
-
-def fetch_all_sheets():
-    dfs = []
-    for sheet in SHEET_GID_MAP.keys():
-        df = load_quality_data(sheet_name=sheet)
-        if not df.empty:
-            df["Sheet"] = sheet
-            dfs.append(df)
-    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
-
-
-def calc_quality(df):
-    df = df.copy()
-    for col in ["Total Cuboids", "Missing Cuboids"]:
-            if col in df.columns: df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    score_cols = ["Geometry", "BL", "DI", "Status", "Visibility", "Class"]
-
-    for col in score_cols:
-        if col in df.columns:
-            df[col + " Score"] = df[col].map(SCORE_MAP)
-
-    def row_quality(row):
-        scores = [row.get(col + " Score") for col in score_cols if pd.notna(row.get(col + " Score"))]
-        if not scores:
-            return 0
-        base = (sum(scores) / len(scores)) / 3 * 100
-
-        total = float(row.get("Total Cuboids") or 0)
-        missing = float(row.get("Missing Cuboids") or 0)
-        penalty = (missing / total * 100) if total > 0 else 0
-        penalty = min(penalty, 30)
-
-        return max(0, base - penalty)
-
-    df["Quality %"] = df.apply(row_quality, axis=1)
-    df["Base Quality %"] = df[[c + " Score" for c in score_cols]].mean(axis=1) / 3 * 100
-    df["Penalty %"] = df.apply(
-        lambda r: min((float(r["Missing Cuboids"] or 0) / float(r["Total Cuboids"] or 1)) * 100, 30)
-        if float(r.get("Total Cuboids") or 0) > 0 else 0, axis=1
-    )
-    if "Date" in df.columns:
-        df["Date_dt"] = pd.to_datetime(df["Date"], errors="coerce", dayfirst=True)
-        today = pd.Timestamp.today().normalize()
-        valid_year = df["Date_dt"].notna() & df["Date_dt"].dt.year.between(2000, today.year + 1)
-        df.loc[~valid_year, "Date_dt"] = pd.NaT
-    return df
+from . import quality_store
+from .data_quality_loader import SHEET_GID_MAP
+from .quality_dataset import (SCORE_MAP, annotator_profiles, calc_quality,  # noqa: F401 (re-exported)
+                              fetch_all_sheets, load_quality_dataset)
+from .roster import RENAMES
+from .scoring_model import DEFAULT_MODEL, METRICS, evaluate_models
+from .profiler import span
+from .memory_monitor import track_frame
 
 
 def classify_quality(q):
-    if q >= 90: return "Excellent"
-    elif q >= 75: return "Good"
-    elif q >= 60: return "Needs Improvement"
-    return "Critical"
+    return DEFAULT_MODEL.classify(q)
 
 
 def text_color(val):
@@ -81,6 +28,52 @@ def text_color(val):
     return ""
 
 
+def _render_what_if(df):
+    """Compare a candidate scoring model (and a penalty-cap sweep) against the current one."""
+    cols = st.columns(len(METRICS))
+    weights = {m: cols[i].number_input(f"{m} weight", 0.0, 5.0, 1.0, 0.5, key=f"what_if_w_{m}")
+               for i, m in enumerate(METRICS)}
+    col1, col2 = st.columns(2)
+    cap = col1.slider("Penalty cap %", 0, 100, int(DEFAULT_MODEL.penalty_cap), key="what_if_cap")
+    power = col2.slider("Penalty curve (exponent on missing %)", 0.5, 2.0, 1.0, 0.1, key="what_if_power")
+    col1, col2, col3 = st.columns(3)
+    (excellent, _), (good, _), (needs, _) = DEFAULT_MODEL.grade_bands
+    bands = (
+        (col1.number_input("Excellent from %", 0, 100, excellent, key="what_if_excellent"), "Excellent"),
+        (col2.number_input("Good from %", 0, 100, good, key="what_if_good"), "Good"),
+        (col3.number_input("Needs Improvement from %", 0, 100, needs, key="what_if_needs"), "Needs Improvement"),
+    )
+    candidate = DEFAULT_MODEL._replace(name="What-if", weights=weights, penalty_cap=cap, penalty_power=power,
+                                       grade_bands=bands)
+
+    sweep = [candidate._replace(name=f"Cap {c}%", penalty_cap=c) for c in range(0, 55, 5)]
+    with span("quality.what_if.evaluate"):
+        results = evaluate_models([DEFAULT_MODEL, candidate] + sweep, df)
+
+    current = results[results["Model"] == DEFAULT_MODEL.name].set_index("Rename")
+    what_if = results[results["Model"] == candidate.name].set_index("Rename")
+    compare = pd.DataFrame({
+        "Current %": current["Quality %"],
+        "What-if %": what_if["Quality %"],
+        "Δ %": what_if["Δ Quality %"],
+        "Current Decision": current["Grade"],
+        "What-if Decision": what_if["Grade"],
+    }).reset_index().sort_values("Δ %")
+    changed = int(what_if["Grade changed"].sum())
+    st.metric("Annotators whose decision changes", changed)
+    st.dataframe(compare.style.map(text_color), hide_index=True)
+
+    st.markdown("**Decisions by penalty cap** (other settings as above)")
+    sweep_counts = (results[results["Model"].str.startswith("Cap ")]
+                    .groupby(["Model", "Grade"]).size().reset_index(name="Annotators"))
+    sweep_counts["Cap %"] = sweep_counts["Model"].str.extract(r"(\d+)", expand=False).astype(int)
+    st.altair_chart(
+        alt.Chart(sweep_counts).mark_bar().encode(
+            x="Cap %:O", y="Annotators:Q", color="Grade:N", tooltip=["Cap %", "Grade", "Annotators"]
+        ).properties(height=250), use_container_width=True
+    )
+
+
 def render_quality_dashboard():
     st.title("🧮 Individual Quality Performance Dashboard")
 
@@ -91,16 +84,18 @@ def render_quality_dashboard():
         selected_person = st.selectbox("Select Annotator", ["All"] + RENAMES)
         date_range = st.date_input("Submission Date Range", value=None)
 
-    df = fetch_all_sheets() if selected_sheet == "All" else load_quality_data(sheet_name=selected_sheet)
-    if selected_sheet != "All" and not df.empty:
-        df["Sheet"] = selected_sheet
-
+    # Rows, duplicate report and profiles come from one resolved dataset entry
+    dataset, _ = load_quality_dataset()
+    df = dataset["rows"]
     if df.empty:
         st.warning("No quality data available.")
         return
+    track_frame("quality.df", df)
 
-    df = calc_quality(df)
-    df = df[df["Rename"] != "Select Names"]
+    if selected_sheet != "All":
+        df = df[df["Sheet"] == selected_sheet]
+    # Running means cover every stored sheet; usable as-is only for the unfiltered view
+    unfiltered = selected_sheet == "All" and selected_person == "All" and not (date_range and len(date_range) == 2)
 
     if selected_person != "All":
         df = df[df["Rename"] == selected_person]
@@ -119,14 +114,24 @@ def render_quality_dashboard():
     col3.metric("Final Quality %", f"{df['Quality %'].mean():.1f}%")
     col4.metric("Jobs Evaluated", f"{df['Job ID'].nunique()}")
 
+    duplicates = dataset["duplicates"]
+    if not duplicates.empty and duplicates["Duplicate rows"].sum():
+        with st.expander(f"🧬 {int(duplicates['Duplicate rows'].sum())} duplicate job rows across sheets "
+                         f"({int(duplicates['Dropped'].sum())} dropped)"):
+            st.dataframe(duplicates, hide_index=True)
+
     # Trend
     st.markdown("### 📈 Quality Trend Over Time")
-    trend = df.groupby("Date_dt")[["Base Quality %", "Quality %"]].mean().reset_index()
-    st.altair_chart(
-        alt.Chart(trend).mark_line(point=True).encode(
-            x="Date_dt:T", y="Quality %:Q", tooltip=["Date_dt", "Base Quality %", "Quality %"]
-        ).properties(height=300), use_container_width=True
-    )
+    if unfiltered:
+        trend = quality_store.means("day")[["Date_dt", "Base Quality %", "Quality %"]]
+    else:
+        trend = df.groupby("Date_dt")[["Base Quality %", "Quality %"]].mean().reset_index()
+    with span("quality.chart.trend"):
+        st.altair_chart(
+            alt.Chart(trend).mark_line(point=True).encode(
+                x="Date_dt:T", y="Quality %:Q", tooltip=["Date_dt", "Base Quality %", "Quality %"]
+            ).properties(height=300), use_container_width=True
+        )
 
     # Breakdown
     st.markdown("### 📊 Score Breakdown by Metric")
@@ -140,14 +145,16 @@ def render_quality_dashboard():
         ).properties(height=300), use_container_width=True
     )
 
+    # Per-annotator profiles: one grouped pass shared by the leaderboard, decisions and improvement areas
+    with span("quality.aggregate.profiles"):
+        profiles = dataset["profiles"] if unfiltered else annotator_profiles(df)
+
     # Leaderboard
     st.markdown("### 🏆 Annotator Leaderboard")
-    per_person = df.groupby("Rename").agg({
-        "Base Quality %": "mean", "Penalty %": "mean", "Quality %": "mean",
-        "Total Cuboids": "sum", "Missing Cuboids": "sum"
-    }).reset_index()
-    per_person["Decision"] = per_person["Quality %"].apply(classify_quality)
-    st.dataframe(per_person.style.map(text_color))
+    per_person = profiles[["Rename", "Base Quality %", "Penalty %", "Quality %", "Total Cuboids",
+                           "Missing Cuboids", "Trend (pts/week)", "Decision"]]
+    with span("quality.table.leaderboard"):
+        st.dataframe(per_person.style.map(text_color, subset=per_person.columns.drop("Trend (pts/week)")))
 
     # Decision summary
     st.markdown("### 📝 Decision Summary")
@@ -157,20 +164,18 @@ def render_quality_dashboard():
 
     # Improvement areas
     st.markdown("### 🔍 Improvement Areas")
-    improvement_df = []
-    for person, sub in df.groupby("Rename"):
-        avg_scores = sub[score_cols].mean()
-        weak = [m.replace(" Score", "") for m, s in avg_scores.items() if pd.notna(s) and s < 3]
-        improvement_df.append({
-            "Annotator": person,
-            "Weakest Areas": ", ".join(weak) if weak else "None",
-            "Quality %": sub["Quality %"].mean()
-        })
-    st.dataframe(pd.DataFrame(improvement_df).style.map(text_color))
+    improvement_df = profiles[["Rename", "Weakest Areas", "Quality %"]].rename(columns={"Rename": "Annotator"})
+    st.dataframe(improvement_df.style.map(text_color))
+
+    # What-if scoring
+    st.markdown("### 🧪 What-if Scoring")
+    with st.expander("Try other metric weights, penalty cap/curve and decision thresholds"):
+        _render_what_if(df)
 
     # Detailed table
     st.markdown("### 📋 Detailed Quality Table")
     detail_cols = ["Rename", "Job ID", "BL", "DI", "Status", "Visibility", "Class", "Geometry",
                    "Base Quality %", "Penalty %", "Quality %", "Sheet", "Date_fmt"]
     detail_df = df[[c for c in detail_cols if c in df.columns]]
-    st.dataframe(detail_df.style.map(text_color))
+    with span("quality.table.detailed"):
+        st.dataframe(detail_df.style.map(text_color))
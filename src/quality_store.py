@@ -0,0 +1,148 @@
+# visionverse_dashboard/src/quality_store.py
+import threading
+
+import pandas as pd
+from .profiler import span
+
+# Process-wide store of scored quality rows keyed by (Sheet, Job ID, occurrence).
+# A refresh hashes the incoming rows and scores only new or changed ones; running
+# sums per person and per day are adjusted by the delta instead of being rebuilt.
+KEY_COLUMNS = ["Sheet", "Job ID", "Occurrence"]
+HASH_COLUMNS = ["Rename", "Job ID", "Total Cuboids", "Missing Cuboids", "Geometry", "BL", "DI", "Status",
+                "Visibility", "Class", "Date"]
+MEAN_COLUMNS = ["Base Quality %", "Penalty %", "Quality %"]
+SUM_COLUMNS = ["Total Cuboids", "Missing Cuboids"]
+EXCLUDED_NAMES = {"Select Names"}
+
+
+def _empty_hashes():
+    return pd.Series(dtype="uint64", index=pd.MultiIndex.from_arrays([[], [], []], names=KEY_COLUMNS))
+
+
+_LOCK = threading.RLock()
+_STATE = {
+    "rows": pd.DataFrame(),
+    "hashes": _empty_hashes(),
+    "sums": {},
+    "last_refresh": {"new": 0, "changed": 0, "removed": 0},
+}
+_GROUPINGS = {"person": "Rename", "day": "Date_dt"}
+
+
+def _keyed(raw: pd.DataFrame) -> pd.DataFrame:
+    """Index raw rows by (Sheet, Job ID, n-th occurrence of that Job ID in the sheet)."""
+    raw = raw.copy()
+    job = raw["Job ID"].astype("string").fillna("") if "Job ID" in raw.columns else pd.Series("", index=raw.index)
+    raw["Occurrence"] = job.groupby([raw["Sheet"], job]).cumcount()
+    index = pd.MultiIndex.from_arrays([raw["Sheet"], job, raw["Occurrence"]], names=KEY_COLUMNS)
+    return raw.drop(columns="Occurrence").set_axis(index)
+
+
+def _row_hashes(raw: pd.DataFrame) -> pd.Series:
+    cols = [c for c in HASH_COLUMNS if c in raw.columns]
+    return pd.util.hash_pandas_object(raw[cols].astype("string"), index=False).set_axis(raw.index)
+
+
+def _contribution(rows: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Per-group sums and non-null counts of the rows that count towards means."""
+    if rows.empty:
+        return pd.DataFrame()
+    rows = rows[rows["Rename"].notna() & ~rows["Rename"].isin(EXCLUDED_NAMES)]
+    values = rows[MEAN_COLUMNS + SUM_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    key = rows[_GROUPINGS[by]]
+    sums = values.groupby(key).sum()
+    counts = values[MEAN_COLUMNS].notna().groupby(key).sum().add_suffix(" n")
+    jobs = key.groupby(key).size().rename("Jobs")
+    return pd.concat([sums, counts, jobs], axis=1)
+
+
+def _apply_delta(by, added, removed):
+    current = _STATE["sums"].get(by, pd.DataFrame())
+    updated = current.add(_contribution(added, by), fill_value=0).sub(_contribution(removed, by), fill_value=0)
+    if not updated.empty:
+        updated = updated[updated["Jobs"] > 0]
+    _STATE["sums"][by] = updated
+
+
+def refresh(raw: pd.DataFrame, score, sheets=None) -> pd.DataFrame:
+    """Merge freshly fetched rows into the store and return the scored rows for `sheets`.
+
+    `score` turns raw rows into scored rows (calc_quality). Rows of sheets listed in
+    `sheets` (default: those present in `raw`) that are no longer in `raw` are removed.
+    """
+    if raw.empty:
+        return raw
+    sheets = list(sheets) if sheets is not None else list(raw["Sheet"].unique())
+    with _LOCK, span("quality_store.refresh"):
+        incoming = _keyed(raw)
+        hashes = _row_hashes(incoming)
+        old_hashes = _STATE["hashes"]
+        rows = _STATE["rows"]
+
+        known = hashes.index.isin(old_hashes.index)
+        unchanged = pd.Series(False, index=hashes.index)
+        unchanged[known] = old_hashes.reindex(hashes.index[known]).to_numpy() == hashes[known].to_numpy()
+        changed_keys = hashes.index[known & ~unchanged.to_numpy()]
+        new_keys = hashes.index[~known]
+
+        in_scope = old_hashes.index.get_level_values("Sheet").isin(sheets)
+        gone_keys = old_hashes.index[in_scope & ~old_hashes.index.isin(hashes.index)]
+
+        dirty_keys = changed_keys.append(gone_keys)
+        to_score = incoming.loc[new_keys.append(changed_keys)]
+        scored = score(to_score) if not to_score.empty else to_score
+        stale = rows.loc[dirty_keys] if not rows.empty else rows
+
+        for by in _GROUPINGS:
+            _apply_delta(by, scored, stale)
+
+        if not rows.empty:
+            rows = rows.drop(index=dirty_keys)
+        rows = pd.concat([rows, scored]) if not rows.empty else scored
+        _STATE["rows"] = rows
+        _STATE["hashes"] = pd.concat([old_hashes.drop(index=dirty_keys), hashes.loc[new_keys.append(changed_keys)]])
+        _STATE["last_refresh"] = {"new": len(new_keys), "changed": len(changed_keys), "removed": len(gone_keys)}
+
+        return rows[rows.index.get_level_values("Sheet").isin(sheets)].reset_index(drop=True)
+
+
+def means(by="person") -> pd.DataFrame:
+    """Running per-person ('Rename') or per-day ('Date_dt') means and cuboid sums over all stored rows."""
+    with _LOCK:
+        sums = _STATE["sums"].get(by, pd.DataFrame())
+    return _finish(sums, _GROUPINGS[by])
+
+
+def team_means(team_of: dict, default="Unassigned") -> pd.DataFrame:
+    """Per-team means, rolled up exactly from the per-person running sums."""
+    with _LOCK:
+        sums = _STATE["sums"].get("person", pd.DataFrame())
+    if sums.empty:
+        return _finish(sums, "Team")
+    team = sums.index.to_series().map(lambda name: team_of.get(str(name).strip(), default))
+    return _finish(sums.groupby(team.to_numpy()).sum(), "Team")
+
+
+def _finish(sums: pd.DataFrame, label: str) -> pd.DataFrame:
+    columns = [label] + MEAN_COLUMNS + SUM_COLUMNS
+    if sums.empty:
+        return pd.DataFrame(columns=columns)
+    out = pd.DataFrame(index=sums.index)
+    for col in MEAN_COLUMNS:
+        out[col] = sums[col] / sums[col + " n"].where(sums[col + " n"] > 0)
+    for col in SUM_COLUMNS:
+        whole = (sums[col] % 1 == 0).all()
+        out[col] = sums[col].astype("int64") if whole else sums[col]
+    out.index.name = label
+    return out.reset_index()[columns]
+
+
+def last_refresh() -> dict:
+    with _LOCK:
+        return dict(_STATE["last_refresh"], stored=len(_STATE["rows"]))
+
+
+def clear():
+    with _LOCK:
+        _STATE.update(rows=pd.DataFrame(), hashes=_empty_hashes(), sums={},
+                      last_refresh={"new": 0, "changed": 0, "removed": 0})
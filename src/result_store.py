@@ -0,0 +1,117 @@
+# visionverse_dashboard/src/result_store.py
+"""Disk-backed store for batch compression results.
+
+Compressed images go straight into an output ZIP on disk; only small per-file
+stats rows stay in memory, and individual files are read back lazily on download.
+"""
+import shutil
+import tempfile
+import weakref
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from .image_compression import add_to_zip, output_name
+
+
+class ResultStore:
+    def __init__(self, root=None):
+        self.directory = Path(tempfile.mkdtemp(prefix="compressed_", dir=root))
+        self.zip_path = self.directory / "compressed_images.zip"
+        self.rows = []
+        self.candidate_kb = {}     # format -> batch total had every file used it (AUTO only)
+        self.candidate_files = {}  # format -> files AUTO tried it on (it may stop early or skip PNG)
+        self._names = set()
+        self._zip = None
+        # Remove the spill directory when the session drops the store.
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def __enter__(self):
+        self._zip = zipfile.ZipFile(self.zip_path, "w")
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self._zip.close()
+        self._zip = None
+        # A batch that failed partway is never handed out, so drop its temp files now
+        if exc_type is not None:
+            self.cleanup()
+
+    def add(self, arcname, result):
+        """Write one result under its format's extension; returns the archive name used.
+
+        A name already in the archive gets a numeric suffix rather than overwriting it.
+        """
+        arcname = output_name(arcname, result.get("format", "JPEG"))
+        path, n = PurePosixPath(arcname), 1
+        while arcname in self._names:
+            n += 1
+            arcname = str(path.with_name(f"{path.stem}-{n}{path.suffix}"))
+        self._names.add(arcname)
+        add_to_zip(self._zip, arcname, result["data"])
+        for fmt, kb in (result.get("candidates") or {}).items():
+            self.candidate_kb[fmt] = self.candidate_kb.get(fmt, 0.0) + kb
+            self.candidate_files[fmt] = self.candidate_files.get(fmt, 0) + 1
+        original_kb, compressed_kb = result["original_size"], result["compressed_size"]
+        self.rows.append({
+            "File": PurePosixPath(arcname).name,
+            "Path": arcname,
+            "Format": result.get("format", "JPEG"),
+            "Original KB": round(original_kb, 1),
+            "Compressed KB": round(compressed_kb, 1),
+            "Saved %": round(100 * (1 - compressed_kb / original_kb), 1) if original_kb else 0.0,
+            "Original dims": "x".join(map(str, result["original_dims"])),
+            "Compressed dims": "x".join(map(str, result["compressed_dims"])),
+        })
+        return arcname
+
+    def __len__(self):
+        return len(self.rows)
+
+    def page(self, number, size):
+        start = (number - 1) * size
+        return self.rows[start:start + size]
+
+    def summary(self):
+        original = sum(r["Original KB"] for r in self.rows)
+        compressed = sum(r["Compressed KB"] for r in self.rows)
+        return {
+            "files": len(self.rows),
+            "original_kb": original,
+            "compressed_kb": compressed,
+            "saved_pct": 100 * (1 - compressed / original) if original else 0.0,
+        }
+
+    def format_report(self):
+        """Per output format: files, bytes in/out and saved; plus, under AUTO, the all-in-one-format
+        total for formats that were tried on every file."""
+        report = {}
+        for r in self.rows:
+            entry = report.setdefault(r["Format"], {"Format": r["Format"], "Files": 0, "Original KB": 0.0, "Output KB": 0.0})
+            entry["Files"] += 1
+            entry["Original KB"] += r["Original KB"]
+            entry["Output KB"] += r["Compressed KB"]
+        for fmt in self.candidate_kb:
+            report.setdefault(fmt, {"Format": fmt, "Files": 0, "Original KB": 0.0, "Output KB": 0.0})
+        rows = []
+        for fmt, entry in report.items():
+            entry["Saved KB"] = entry["Original KB"] - entry["Output KB"]
+            if self.candidate_kb:
+                tried_all = self.candidate_files.get(fmt) == len(self.rows)
+                entry["KB if all this format"] = self.candidate_kb.get(fmt) if tried_all else None
+            rows.append({k: round(v, 1) if isinstance(v, float) else v for k, v in entry.items()})
+        return rows
+
+    def reader(self, arcname):
+        """Zero-argument callable for st.download_button: reads one member only when clicked."""
+        zip_path = self.zip_path
+
+        def read():
+            with zipfile.ZipFile(zip_path) as z:
+                return z.read(arcname)
+        return read
+
+    def zip_reader(self):
+        return self.zip_path.read_bytes
+
+    def cleanup(self):
+        self._finalizer()
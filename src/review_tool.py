@@ -1,6 +1,110 @@
 # visionverse_dashboard/src/review_tool.py
+import hashlib
+import io
+
 import streamlit as st
 import pandas as pd
+from . import data_store, job_lineage
+from .data_loader import _to_csv_export_url
+from .profiler import span
+from .quality_dataset import load_quality_dataset
+from .sheet_fetch import fetch_body
+
+# Typed ingestion: only these columns are read (when present), dates use an explicit
+# format first, and Status is categorical.
+DATE_FORMAT = "%d/%m/%Y"
+DATE_COLUMNS = ["Start date", "End date"]
+LOG_COLUMNS = {
+    "maker": ["Job ID", "Status", "Start date", "End date", "Maker", "Annotator", "Name"],
+    "editor": ["Editing Job ID", "Job ID", "Status", "Start date", "End date", "Editor", "Name"],
+}
+ID_COLUMNS = ["Job ID", "Editing Job ID"]
+CHUNK_ROWS = 100_000   # large logs are read in chunks; dates are parsed per chunk so raw strings don't pile up
+
+
+def _parse_distinct(distinct, fmt):
+    parsed = pd.to_datetime(distinct, format=fmt, errors="coerce")
+    for fallback in ({"format": "ISO8601"}, {"format": "mixed", "dayfirst": True}):
+        leftover = parsed.isna()
+        if not leftover.any():
+            break
+        parsed[leftover] = pd.to_datetime(distinct[leftover], errors="coerce", **fallback)
+    return parsed
+
+
+def parse_dates(values, fmt=DATE_FORMAT):
+    """Parse each distinct value once: `fmt` first, then ISO, then dayfirst inference for the rest."""
+    codes, distinct = pd.factorize(values.str.strip())
+    parsed = _parse_distinct(pd.Series(distinct), fmt).to_numpy()
+    return pd.Series(pd.NaT, index=values.index, dtype=parsed.dtype).where(codes < 0, parsed.take(codes))
+
+
+def _typed_chunk(chunk):
+    chunk.columns = chunk.columns.str.strip()
+    for col in DATE_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = parse_dates(chunk[col])
+    return chunk
+
+
+def parse_job_log(data: bytes, kind: str) -> pd.DataFrame:
+    """Read a maker/editor job log CSV into typed columns, CHUNK_ROWS rows at a time.
+
+    Raises ValueError when the body has none of the log's columns (e.g. a sign-in page);
+    pandas parser errors propagate to the caller.
+    """
+    header = pd.read_csv(io.BytesIO(data), nrows=0).columns
+    raw = {c.strip(): c for c in header if str(c).strip() in LOG_COLUMNS[kind]}
+    if not raw:
+        raise ValueError(f"none of the expected columns ({', '.join(LOG_COLUMNS[kind])}) were found")
+    chunks = pd.read_csv(
+        io.BytesIO(data),
+        usecols=list(raw.values()),
+        dtype={raw[c]: "string" for c in ID_COLUMNS + DATE_COLUMNS + ["Status"] if c in raw},
+        chunksize=CHUNK_ROWS,
+    )
+    df = pd.concat([_typed_chunk(chunk) for chunk in chunks], ignore_index=True)
+    if "Status" in df.columns:
+        df["Status"] = df["Status"].str.strip().astype("category")
+    return df
+
+
+def load_job_log(data: bytes, kind: str) -> pd.DataFrame:
+    """Parse once per distinct file content; reruns and other sessions reuse the shared copy."""
+    content_hash = hashlib.sha1(data).hexdigest()[:12]
+    with span(f"review.load_{kind}"):
+        return data_store.get(f"review_{kind}_log", content_hash, lambda: parse_job_log(data, kind))
+
+
+def _read_source(url, upload, label):
+    """Bytes from a sheet link (with last-known-good fallback) or an uploaded file."""
+    if url:
+        body, meta = fetch_body(_to_csv_export_url(url.strip()))
+        if meta["stale"]:
+            st.warning(f"⚠️ {label} Sheet is unreachable ({meta['error']}). Showing the last copy that loaded.")
+        else:
+            st.success(f"✅ {label} data loaded from Google Sheets")
+        return body
+    if upload:
+        return upload.getvalue()
+    return None
+
+
+def _load_log(url, upload, label, kind):
+    """Typed log from a link or upload; None (with an error shown) if it can't be fetched or read."""
+    try:
+        data = _read_source(url, upload, label)
+        return load_job_log(data, kind) if data is not None else None
+    except Exception as e:
+        st.error(f"Error loading {label} {'Sheet' if url else 'file'}: {e}")
+        return None
+
+
+def _status_summary(df, id_col):
+    summary = df.groupby('Status', observed=True)[id_col].count().reset_index()
+    summary.columns = ['Status', 'Count']
+    return summary
+
 
 def render_review_tool():
     st.title("👥 Annotation Review Tracker")
@@ -18,53 +122,57 @@ def render_review_tool():
     editor_file = st.file_uploader("Upload Editor Job Log (CSV)", type=["csv"], key="editor")
 
     # Load Maker Data
-    maker_df = None
-    if maker_url:
-        try:
-            maker_df = pd.read_csv(maker_url)
-            st.success("✅ Maker data loaded from Google Sheets")
-        except Exception as e:
-            st.error(f"Error loading Maker Sheet: {e}")
-    elif maker_file:
-        maker_df = pd.read_csv(maker_file)
+    maker_df = _load_log(maker_url, maker_file, "Maker", "maker")
 
     if maker_df is not None:
         st.subheader("🛠️ Maker Job Summary")
-        maker_df.columns = maker_df.columns.str.strip()
-        maker_df['Start date'] = pd.to_datetime(maker_df['Start date'], errors='coerce', dayfirst=True)
-        maker_df['End date'] = pd.to_datetime(maker_df['End date'], errors='coerce', dayfirst=True)
         st.dataframe(maker_df)
 
         if 'Status' in maker_df.columns and 'Job ID' in maker_df.columns:
-            summary = maker_df.groupby('Status')['Job ID'].count().reset_index()
-            summary.columns = ['Status', 'Count']
             st.markdown("**📊 Maker Job Status Overview:**")
-            st.dataframe(summary)
+            st.dataframe(_status_summary(maker_df, 'Job ID'))
 
     # Load Editor Data
-    editor_df = None
-    if editor_url:
-        try:
-            editor_df = pd.read_csv(editor_url)
-            st.success("✅ Editor data loaded from Google Sheets")
-        except Exception as e:
-            st.error(f"Error loading Editor Sheet: {e}")
-    elif editor_file:
-        editor_df = pd.read_csv(editor_file)
+    editor_df = _load_log(editor_url, editor_file, "Editor", "editor")
 
     if editor_df is not None:
         st.subheader("✍️ Editor Job Summary")
-        editor_df.columns = editor_df.columns.str.strip()
-        editor_df['Start date'] = pd.to_datetime(editor_df['Start date'], errors='coerce', dayfirst=True)
-        editor_df['End date'] = pd.to_datetime(editor_df['End date'], errors='coerce', dayfirst=True)
         st.dataframe(editor_df)
 
         if 'Status' in editor_df.columns and 'Editing Job ID' in editor_df.columns:
-            summary = editor_df.groupby('Status')['Editing Job ID'].count().reset_index()
-            summary.columns = ['Status', 'Count']
             st.markdown("**📊 Editor Job Status Overview:**")
-            st.dataframe(summary)
-# ...existing code...
+            st.dataframe(_status_summary(editor_df, 'Editing Job ID'))
+
+    if maker_df is not None or editor_df is not None:
+        _render_lineage(maker_df, editor_df)
+
+
+def _render_lineage(maker_df, editor_df):
+    st.subheader("🔗 Job Lineage (Maker → Editor → Quality)")
+    quality_df = load_quality_dataset()[0]["rows"] if st.checkbox("Include quality reviews", value=True) else None
+    lineage = job_lineage.lineage_for(maker_df, editor_df, quality_df)
+    stats = job_lineage.summary(lineage)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Jobs", f"{stats['jobs']:,}")
+    col2.metric("Median turnaround (days)", f"{stats['median_turnaround_days']:.1f}" if pd.notna(stats['median_turnaround_days']) else "–")
+    col3.metric("Median wait for editor (days)", f"{stats['median_edit_wait_days']:.1f}" if pd.notna(stats['median_edit_wait_days']) else "–")
+    col4.metric("Rework rate", f"{stats['rework_rate']:.0%}")
+
+    throughput = job_lineage.stage_throughput(lineage)
+    if not throughput.empty:
+        st.markdown("**📈 Jobs completed per stage per day:**")
+        st.line_chart(throughput)
 
-if __name__ == "__main__":
-    render_review_tool()
\ No newline at end of file
+    col1, col2 = st.columns(2)
+    job_id = col1.text_input("🔍 Look up a Job ID")
+    if job_id:
+        row = job_lineage.job(lineage, job_id)
+        if row is None:
+            col1.warning(f"No job '{job_id}' in the loaded logs.")
+        else:
+            col1.dataframe(row.rename("Value").astype("string"))
+    people = sorted(lineage["by_person"])
+    person = col2.selectbox("👤 Jobs by annotator", ["—"] + people)
+    if person != "—":
+        col2.dataframe(job_lineage.person_jobs(lineage, person))
@@ -0,0 +1,78 @@
+# visionverse_dashboard/src/roster.py
+import numpy as np
+import pandas as pd
+
+# Canonical annotator names as they appear in the quality sheets
+RENAMES = [
+    "Thashvi (Amulya)", "Jyothi (Arpitha)", "Deepika (Chandana)", "Shilpa (Divya)", "Chandu M", "Shivukumar",
+    "Dhanushree", "Praveen (Babu M)", "Bhanushekar (AvinaShree)", "Abhinashree", "Nayana", "Kruthi",
+    "PriyaPragathi (Sushmitha S)", "Priyanka (Mokshashree CM)", "Sneha KM", "Mohammad", "Abhishek", "Nisarga",
+    "Aarohi", "Manu", "Mukund", "Sharath", "Ravi", "Nisha", "Madhushree", "Sowjanya", "Danny", "Sushma",
+    "Ramesh", "Nithin"
+]
+
+TEAM_STRUCTURE = {
+    "A": {"Coordinator": "Abhina", "Lead Editor": "Sharath",
+          "Members": ["Bhanushekar (AvinaShree)", "Abhinashree",
+                      "Priyanka (Mokshashree CM)", "PriyaPragathi (Sushmitha S)"]},
+    "B": {"Coordinator": "Aina", "Lead Editor": "Danny",
+          "Members": ["Chandu M", "Aarohi", "Kruthi", "Shivukumar"]},
+    "C": {"Coordinator": "Nayana", "Lead Editor": "Ravi",
+          "Members": ["Thashvi (Amulya)", "Jyothi (Arpitha)", "Deepika (Chandana)", "Nayana"]},
+    "D": {"Coordinator": "Dhanushree", "Lead Editor": "Vinod",
+          "Members": ["Nisarga", "Shilpa (Divya)", "Dhanushree", "Sneha KM"]},
+    "E": {"Coordinator": "Babu", "Lead Editor": "Ramesh",
+          "Members": ["Praveen (Babu M)", "Manu", "Abhishek", "Mohammad"]}
+}
+
+UNASSIGNED = "Unassigned"
+
+
+def expand_aliases(name: str):
+    """'Thashvi (Amulya)' -> the full name plus 'Thashvi' and 'Amulya'."""
+    results = [name.strip()]
+    if '(' in name and ')' in name:
+        before, rest = name.split('(', 1)
+        before = before.strip()
+        inside = rest.split(')', 1)[0]
+        alts = [a.strip() for a in inside.replace('/', ',').split(',') if a.strip()]
+        results.extend([before] + alts)
+    return list(set(results))
+
+
+def team_members(team: str):
+    info = TEAM_STRUCTURE[team]
+    return [info["Coordinator"], info["Lead Editor"]] + info["Members"]
+
+
+def alias_index():
+    """Every alias -> (team, canonical name). Later teams win, as in the original mapping."""
+    index = {}
+    for team in TEAM_STRUCTURE:
+        for name in team_members(team):
+            for alias in expand_aliases(name):
+                index[alias] = (team, name.strip())
+    return index
+
+
+def known_names():
+    """Every name or alias the roster recognises (team members plus the quality-sheet names)."""
+    names = set(alias_index())
+    for name in RENAMES:
+        names.update(expand_aliases(name))
+    return names
+
+
+def annotator_to_team():
+    return {alias: team for alias, (team, _) in alias_index().items()}
+
+
+def resolve(names: pd.Series) -> pd.DataFrame:
+    """Vectorized alias lookup: 'Team' and 'Canonical' for each name (looked up once per distinct value)."""
+    index = alias_index()
+    codes, distinct = pd.factorize(names.astype("string").str.strip())
+    hits = [index.get(n, (UNASSIGNED, n)) for n in distinct]
+    # Missing names have code -1, which picks the trailing sentinel
+    teams = np.array([h[0] for h in hits] + [UNASSIGNED], dtype=object)
+    canonical = np.array([h[1] for h in hits] + [None], dtype=object)
+    return pd.DataFrame({"Team": teams[codes], "Canonical": canonical[codes]}, index=names.index)
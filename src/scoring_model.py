@@ -0,0 +1,131 @@
+# visionverse_dashboard/src/scoring_model.py
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["Geometry", "BL", "DI", "Status", "Visibility", "Class"]
+SCORE_MAP = {"Poor": 1, "Average": 2, "Good": 2.5, "Excellent": 3}
+GRADE_BANDS = ((90, "Excellent"), (75, "Good"), (60, "Needs Improvement"))
+LOWEST_GRADE = "Critical"
+
+
+class ScoringModel(NamedTuple):
+    """How a reviewed job becomes a Quality %.
+
+    base    = weighted mean of mapped metric scores, as % of the best score
+    penalty = min(penalty_cap, penalty_scale * missing_pct ** penalty_power)
+    quality = max(0, base - penalty); 0 when no metric was scored
+    """
+    name: str = "Current"
+    weights: dict = {m: 1.0 for m in METRICS}
+    score_map: dict = SCORE_MAP
+    penalty_cap: float = 30.0
+    penalty_scale: float = 1.0
+    penalty_power: float = 1.0
+    grade_bands: tuple = GRADE_BANDS
+
+    def classify(self, q):
+        for threshold, grade in self.grade_bands:
+            if q >= threshold:
+                return grade
+        return LOWEST_GRADE
+
+    def grades(self, q):
+        """Vectorized classify over an array of Quality % values."""
+        q = np.asarray(q, dtype=float)
+        out = np.full(q.shape, LOWEST_GRADE, dtype=object)
+        for threshold, grade in reversed(self.grade_bands):
+            out[q >= threshold] = grade
+        return out
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add '<metric> Score', 'Quality %', 'Base Quality %' and 'Penalty %' columns (vectorized)."""
+        df = df.copy()
+        metrics = [m for m in METRICS if m in df.columns]
+        for m in metrics:
+            df[m + " Score"] = df[m].map(self.score_map)
+        scores = df[[m + " Score" for m in metrics]].to_numpy(dtype=float)
+        weights = np.array([self.weights.get(m, 1.0) for m in metrics], dtype=float)
+        base, scored = _base(scores[None], weights[None], max(self.score_map.values()))
+        penalty = _penalty(_missing_pct(df), np.array([self.penalty_cap]), np.array([self.penalty_scale]),
+                           np.array([self.penalty_power]))
+        df["Quality %"] = np.where(scored[0], np.maximum(0, base[0] - penalty[0]), 0)
+        df["Base Quality %"] = np.where(scored[0], base[0], np.nan)
+        df["Penalty %"] = penalty[0]
+        return df
+
+
+DEFAULT_MODEL = ScoringModel()
+
+
+def _missing_pct(df):
+    total = pd.to_numeric(df.get("Total Cuboids", 0), errors="coerce")
+    missing = pd.to_numeric(df.get("Missing Cuboids", 0), errors="coerce")
+    total = np.broadcast_to(np.nan_to_num(np.asarray(total, dtype=float)), (len(df),))
+    missing = np.broadcast_to(np.nan_to_num(np.asarray(missing, dtype=float)), (len(df),))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, missing / np.where(total > 0, total, 1) * 100, 0.0)
+
+
+def _base(scores, weights, best):
+    """scores (K, n, m) with NaN for unscored, weights (K, m) -> (base %, any-scored mask), each (K, n)."""
+    present = ~np.isnan(scores)
+    w = np.where(present, weights[:, None, :], 0.0)
+    total_w = w.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base = (np.nan_to_num(scores) * w).sum(axis=-1) / total_w / np.asarray(best).reshape(-1, 1) * 100
+    return base, total_w > 0
+
+
+def _penalty(missing_pct, cap, scale, power):
+    """missing_pct (n,), per-model cap/scale/power (K,) -> (K, n)."""
+    curve = scale[:, None] * np.power(missing_pct[None, :], power[:, None])
+    return np.minimum(curve, cap[:, None])
+
+
+def evaluate_models(models, df: pd.DataFrame, by="Rename") -> pd.DataFrame:
+    """Score every job under every model at once and aggregate per `by` group.
+
+    Jobs become a (models × jobs × metrics) score tensor; per-group means come from a
+    single bincount over (model, group). Returns one row per (model, group) with the
+    mean Quality % and grade, plus the change against the first model.
+    """
+    models = list(models)
+    metrics = [m for m in METRICS if m in df.columns]
+    k, n = len(models), len(df)
+
+    # Label codes once; each model only supplies a lookup table
+    labels = sorted({label for model in models for label in model.score_map})
+    codes = np.stack([pd.Categorical(df[m], categories=labels).codes for m in metrics], axis=-1) if metrics else np.zeros((n, 0), int)
+    tables = np.array([[model.score_map.get(label, np.nan) for label in labels] + [np.nan] for model in models])
+    scores = tables[np.arange(k)[:, None, None], codes[None]]          # code -1 -> trailing NaN
+    weights = np.array([[model.weights.get(m, 1.0) for m in metrics] for model in models], dtype=float).reshape(k, len(metrics))
+    best = np.array([max(model.score_map.values()) for model in models], dtype=float)
+
+    base, scored = _base(scores, weights, best)
+    penalty = _penalty(_missing_pct(df),
+                       np.array([m.penalty_cap for m in models], dtype=float),
+                       np.array([m.penalty_scale for m in models], dtype=float),
+                       np.array([m.penalty_power for m in models], dtype=float))
+    quality = np.where(scored, np.maximum(0, base - penalty), 0)
+
+    group_codes, groups = pd.factorize(df[by])
+    valid = group_codes >= 0
+    g = len(groups)
+    flat = (np.arange(k)[:, None] * g + group_codes[None, :])[:, valid].ravel()
+    sums = np.bincount(flat, weights=quality[:, valid].ravel(), minlength=k * g).reshape(k, g)
+    counts = np.bincount(group_codes[valid], minlength=g)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+
+    out = pd.DataFrame({
+        "Model": np.repeat([m.name for m in models], g),
+        by: np.tile(np.asarray(groups, dtype=object), k),
+        "Jobs": np.tile(counts, k),
+        "Quality %": means.ravel(),
+        "Grade": np.concatenate([model.grades(means[i]) for i, model in enumerate(models)]),
+    })
+    out["Δ Quality %"] = out["Quality %"] - np.tile(means[0], k)
+    out["Grade changed"] = out["Grade"].to_numpy() != np.tile(models[0].grades(means[0]), k)
+    return out
@@ -0,0 +1,19 @@
+# visionverse_dashboard/src/settings.py
+import os
+import streamlit as st
+
+
+def get_setting(*names, default=None):
+    """First configured value among `names`, from Streamlit secrets then the environment."""
+    for name in names:
+        try:
+            value = st.secrets.get(name)
+        except Exception:
+            value = None
+        if value:
+            return value
+    for name in names:
+        value = os.getenv(name)
+        if value:
+            return value
+    return default
@@ -0,0 +1,185 @@
+# visionverse_dashboard/src/sheet_fetch.py
+import hashlib
+import http.client
+import io
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+from .settings import get_setting
+
+# Bounded retries with full-jitter exponential backoff
+RETRY_ATTEMPTS = 3
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 4.0
+FETCH_TIMEOUT_S = 20
+
+# Circuit breaker: open after N consecutive failures, probe again after the cooldown
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_S = 60
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+_LOCK = threading.Lock()
+_BREAKERS = {}
+_LAST_GOOD = {}
+
+
+class FetchError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(FetchError):
+    pass
+
+
+def _endpoint(url):
+    """Breaker key: scheme, host and path, plus the sheet tab (gid) when there is one."""
+    parts = urlsplit(url)
+    endpoint = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    gid = parse_qs(parts.query).get("gid")
+    return f"{endpoint}?gid={gid[0]}" if gid else endpoint
+
+
+def _breaker(endpoint):
+    return _BREAKERS.setdefault(endpoint, {"state": "closed", "failures": 0, "opened_at": 0.0})
+
+
+def _allow_request(endpoint):
+    """Closed: allow. Open: refuse until the cooldown passes, then let one probe through."""
+    with _LOCK:
+        b = _breaker(endpoint)
+        if b["state"] == "open":
+            if time.time() - b["opened_at"] < BREAKER_COOLDOWN_S:
+                return False
+            b["state"] = "half-open"
+            return True
+        if b["state"] == "half-open":
+            return False
+        return True
+
+
+def _record_result(endpoint, ok):
+    with _LOCK:
+        b = _breaker(endpoint)
+        if ok:
+            b.update(state="closed", failures=0)
+            return
+        b["failures"] += 1
+        if b["state"] == "half-open" or b["failures"] >= BREAKER_FAILURE_THRESHOLD:
+            b.update(state="open", opened_at=time.time())
+
+
+def _fetch_once(url):
+    req = urllib.request.Request(url, headers={"User-Agent": "visionverse-dashboard"})
+    with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_S) as resp:
+        return resp.read()
+
+
+def fetch_bytes(url):
+    """GET with bounded, jittered retries behind a per-endpoint circuit breaker."""
+    endpoint = _endpoint(url)
+    if not _allow_request(endpoint):
+        raise CircuitOpenError(f"Circuit open for {endpoint}; not retrying until cooldown ends")
+
+    # Recorded in `finally` so that any exception, expected or not, moves the breaker
+    # out of half-open
+    ok = False
+    try:
+        last_error = None
+        for attempt in range(RETRY_ATTEMPTS):
+            if attempt:
+                time.sleep(random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt)))
+            try:
+                body = _fetch_once(url)
+                ok = True
+                return body
+            except urllib.error.HTTPError as e:
+                last_error = FetchError(f"HTTP Error {e.code}: {e.reason}", status=e.code)
+                if e.code not in RETRYABLE_STATUSES:
+                    # Permission/not-found errors will not fix themselves; the endpoint itself
+                    # answered, so don't retry and don't count it against the breaker.
+                    ok = True
+                    raise last_error
+            except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError) as e:
+                last_error = FetchError(str(e))
+        raise last_error
+    finally:
+        _record_result(endpoint, ok)
+
+
+def _disk_path(url):
+    cache_dir = get_setting("SHEET_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / (hashlib.sha1(url.encode()).hexdigest() + ".csv")
+
+
+def _remember(url, body):
+    fetched_at = time.time()
+    with _LOCK:
+        _LAST_GOOD[url] = {"body": body, "fetched_at": fetched_at}
+    path = _disk_path(url)
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+        except OSError:
+            pass
+    return fetched_at
+
+
+def _last_good(url):
+    with _LOCK:
+        entry = _LAST_GOOD.get(url)
+    if entry is not None:
+        return entry
+    path = _disk_path(url)
+    if path is not None and path.is_file():
+        return {"body": path.read_bytes(), "fetched_at": path.stat().st_mtime}
+    return None
+
+
+def fetch_body(url):
+    """Raw response body with the same last-known-good fallback as fetch_csv; returns (body, meta)."""
+    if urlsplit(url).scheme not in ("http", "https"):
+        return Path(url).read_bytes(), {"stale": False, "fetched_at": time.time(), "error": None}
+    try:
+        body = fetch_bytes(url)
+    except FetchError as e:
+        cached = _last_good(url)
+        if cached is None:
+            raise
+        return cached["body"], {"stale": True, "fetched_at": cached["fetched_at"], "error": str(e)}
+    return body, {"stale": False, "fetched_at": _remember(url, body), "error": None}
+
+
+def fetch_csv(url, **read_csv_kwargs):
+    """Read a CSV sheet export, falling back to the last known good copy during outages.
+
+    Returns (df, meta) where meta has 'stale', 'fetched_at' and 'error'. Raises
+    FetchError only when the fetch fails and no good copy has ever been seen.
+    """
+    if urlsplit(url).scheme not in ("http", "https"):
+        return pd.read_csv(url, **read_csv_kwargs), {"stale": False, "fetched_at": time.time(), "error": None}
+
+    try:
+        body = fetch_bytes(url)
+        df = pd.read_csv(io.BytesIO(body), **read_csv_kwargs)
+    except (FetchError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        error = e if isinstance(e, FetchError) else FetchError(f"Unreadable CSV: {e}")
+        cached = _last_good(url)
+        if cached is None:
+            raise error
+        df = pd.read_csv(io.BytesIO(cached["body"]), **read_csv_kwargs)
+        return df, {"stale": True, "fetched_at": cached["fetched_at"], "error": str(error)}
+
+    fetched_at = _remember(url, body)
+    return df, {"stale": False, "fetched_at": fetched_at, "error": None}
@@ -0,0 +1,267 @@
+# visionverse_dashboard/src/sheets_emulator.py
+"""Local stand-in for the Google Sheets CSV endpoints.
+
+Replays recorded CSV exports by sheet ID and gid and can inject latency,
+throttling, truncated bodies and 401/403/5xx responses.
+
+    python -m src.sheets_emulator record --dir recordings
+    python -m src.sheets_emulator serve --dir recordings --port 8765 --latency-ms 800 --fail-rate 0.2
+
+Point the dashboard at it with
+    GOOGLE_SHEET_URL=http://127.0.0.1:8765/spreadsheets/d/e/<team id>/pub?gid=0&single=true&output=csv
+    QUALITY_SHEET_BASE_URL=http://127.0.0.1:8765
+
+Fault settings can be changed at runtime with POST /__faults (JSON body) and read with GET /__faults.
+"""
+import argparse
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import urllib.request
+import zlib
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import DEFAULT_GOOGLE_SHEET_CSV
+from .data_quality_loader import BASE_URL as QUALITY_BASE_URL, SHEET_GID_MAP
+
+TEAM_CSV = Path(__file__).resolve().parent.parent / "data" / "daily_cuboids.csv"
+SCORE_LABELS = ["Poor", "Average", "Good", "Excellent"]
+
+DEFAULT_FAULTS = {
+    "latency_ms": 0,         # added before every response
+    "jitter_ms": 0,          # uniform extra latency in [0, jitter_ms]
+    "throttle_kbps": 0,      # 0 = unthrottled
+    "truncate_rate": 0.0,    # share of responses cut to half their body
+    "fail_rate": 0.0,        # share of responses replaced by an error status
+    "fail_statuses": [500, 502, 503],
+}
+
+_SHEET_PATH = re.compile(r"^/spreadsheets/d/(?:e/)?([A-Za-z0-9_-]+)/(?:pub|export)$")
+
+
+def sheet_id_of(url):
+    m = re.search(r"/spreadsheets/d/(?:e/)?([A-Za-z0-9_-]+)", url)
+    return m.group(1) if m else None
+
+
+TEAM_SHEET_ID = sheet_id_of(DEFAULT_GOOGLE_SHEET_CSV)
+QUALITY_SHEET_ID = sheet_id_of(QUALITY_BASE_URL)
+
+
+def team_url(base):
+    """GOOGLE_SHEET_URL value that makes load_team_data read from the emulator."""
+    return f"{base}/spreadsheets/d/e/{TEAM_SHEET_ID}/pub?gid=0&single=true&output=csv"
+
+
+def synthetic_quality_csv(sheet, rows=200, seed=0):
+    """Quality sheet export with the real headers and plausible values."""
+    from .roster import RENAMES
+
+    rng = np.random.default_rng(zlib.crc32(f"{sheet}:{seed}".encode()))
+    dates = pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 60, rows), unit="D")
+    total = rng.integers(50, 400, rows)
+    p = [0.05, 0.15, 0.3, 0.5]
+    df = pd.DataFrame({
+        "Telus Names": rng.choice(RENAMES + ["Select Names"], rows),
+        "JOB_ID": [f"{sheet[:3].upper()}-{i:05d}" for i in range(rows)],
+        "Total Cuboids From Makers": total,
+        "Missing Cuboids Annotated": (total * rng.uniform(0, 0.2, rows)).astype(int),
+        "Geometry Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "BL Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "DI Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "Status Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "Visibilty Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "Class Score": rng.choice(SCORE_LABELS, rows, p=p),
+        "Submission Date": dates.strftime("%d/%m/%Y"),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def seed_recordings(directory, quality_rows=200, seed=0):
+    """Write the bundled team CSV and synthetic quality sheets in the recordings layout."""
+    directory = Path(directory)
+    (directory / TEAM_SHEET_ID).mkdir(parents=True, exist_ok=True)
+    (directory / TEAM_SHEET_ID / "0.csv").write_bytes(TEAM_CSV.read_bytes())
+    (directory / QUALITY_SHEET_ID).mkdir(parents=True, exist_ok=True)
+    for sheet, gid in SHEET_GID_MAP.items():
+        (directory / QUALITY_SHEET_ID / f"{gid}.csv").write_bytes(synthetic_quality_csv(sheet, quality_rows, seed))
+    return directory
+
+
+def record(directory, timeout=30):
+    """Fetch the live team and quality sheets into the recordings layout."""
+    directory = Path(directory)
+    targets = [(TEAM_SHEET_ID, "0", DEFAULT_GOOGLE_SHEET_CSV)]
+    targets += [(QUALITY_SHEET_ID, gid, QUALITY_BASE_URL.format(gid=gid)) for gid in SHEET_GID_MAP.values()]
+    for sheet_id, gid, url in targets:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            body = resp.read()
+        (directory / sheet_id).mkdir(parents=True, exist_ok=True)
+        (directory / sheet_id / f"{gid}.csv").write_bytes(body)
+        print(f"recorded {sheet_id}/{gid}.csv ({len(body):,} bytes)")
+
+
+class SheetsEmulator:
+    def __init__(self, recordings_dir, faults=None, host="127.0.0.1", port=0, seed=None):
+        self.recordings_dir = Path(recordings_dir)
+        self.faults = dict(DEFAULT_FAULTS, **(faults or {}))
+        self.stats = {"requests": 0, "errors": 0, "truncated": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def set_faults(self, **faults):
+        with self._lock:
+            self.faults.update(faults)
+
+    def _decide(self):
+        """Draw the fault outcome for one request: (delay seconds, error status or None, truncate)."""
+        with self._lock:
+            f = dict(self.faults)
+            delay = (f["latency_ms"] + self._rng.uniform(0, f["jitter_ms"])) / 1000
+            status = self._rng.choice(f["fail_statuses"]) if self._rng.random() < f["fail_rate"] else None
+            truncate = status is None and self._rng.random() < f["truncate_rate"]
+            self.stats["requests"] += 1
+            self.stats["errors"] += status is not None
+            self.stats["truncated"] += truncate
+        return delay, status, truncate, f["throttle_kbps"]
+
+    def _handler(self):
+        emulator = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, body, content_type="text/csv", declared=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(declared if declared is not None else len(body)))
+                self.end_headers()
+                return body
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/__faults":
+                    body = json.dumps({"faults": emulator.faults, "stats": emulator.stats}).encode()
+                    self.wfile.write(self._send(200, body, "application/json"))
+                    return
+
+                m = _SHEET_PATH.match(parts.path)
+                gid = parse_qs(parts.query).get("gid", ["0"])[0]
+                path = emulator.recordings_dir / m.group(1) / f"{gid}.csv" if m else None
+                if path is None or not path.is_file():
+                    self.wfile.write(self._send(404, b"Not Found", "text/plain"))
+                    return
+
+                delay, status, truncate, throttle_kbps = emulator._decide()
+                if delay:
+                    time.sleep(delay)
+                if status is not None:
+                    self.wfile.write(self._send(status, f"Error {status}".encode(), "text/html"))
+                    return
+
+                body = path.read_bytes()
+                if truncate:
+                    # Declare the full length but close after half the body.
+                    self._send(200, b"", declared=len(body))
+                    self.wfile.write(body[: len(body) // 2])
+                    self.close_connection = True
+                    return
+
+                self._send(200, body)
+                if not throttle_kbps:
+                    self.wfile.write(body)
+                    return
+                chunk = max(1, int(throttle_kbps * 1024 / 10))
+                for i in range(0, len(body), chunk):
+                    self.wfile.write(body[i:i + chunk])
+                    self.wfile.flush()
+                    time.sleep(0.1)
+
+            def do_POST(self):
+                if urlsplit(self.path).path != "/__faults":
+                    self.wfile.write(self._send(404, b"Not Found", "text/plain"))
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                emulator.set_faults(**json.loads(self.rfile.read(length) or b"{}"))
+                self.wfile.write(self._send(200, json.dumps(emulator.faults).encode(), "application/json"))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Google Sheets CSV emulator with fault injection.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="fetch the live sheets into a recordings directory")
+    rec.add_argument("--dir", default="recordings")
+
+    seed = sub.add_parser("seed", help="write bundled/synthetic recordings for offline use")
+    seed.add_argument("--dir", default="recordings")
+    seed.add_argument("--quality-rows", type=int, default=200)
+
+    serve = sub.add_parser("serve", help="serve recordings over HTTP")
+    serve.add_argument("--dir", default="recordings")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--seed", type=int, default=None)
+    serve.add_argument("--latency-ms", type=float, default=0)
+    serve.add_argument("--jitter-ms", type=float, default=0)
+    serve.add_argument("--throttle-kbps", type=float, default=0)
+    serve.add_argument("--truncate-rate", type=float, default=0.0)
+    serve.add_argument("--fail-rate", type=float, default=0.0)
+    serve.add_argument("--fail-statuses", default="500,502,503",
+                       help="comma-separated statuses to inject, e.g. 401,403,503")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.dir)
+        return
+    if args.command == "seed":
+        print(f"seeded {seed_recordings(args.dir, args.quality_rows)}")
+        return
+
+    faults = {
+        "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "throttle_kbps": args.throttle_kbps,
+        "truncate_rate": args.truncate_rate, "fail_rate": args.fail_rate,
+        "fail_statuses": [int(s) for s in args.fail_statuses.split(",") if s.strip()],
+    }
+    emulator = SheetsEmulator(args.dir, faults, args.host, args.port, args.seed).start()
+    print(f"serving {args.dir} on {emulator.base_url}")
+    print(f"  GOOGLE_SHEET_URL={team_url(emulator.base_url)}")
+    print(f"  QUALITY_SHEET_BASE_URL={emulator.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# visionverse_dashboard/src/targets.py
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from . import data_store, roster
+from .settings import get_setting
+
+# Daily targets versioned by effective date. Each row of data/targets.csv applies from
+# `effective_from` until a later row for the same key replaces it. The most specific
+# row wins: a `person` row (any role), then a `team` + `role` row, then a `role` row.
+TARGETS_CSV = Path(__file__).resolve().parent.parent / "data" / "targets.csv"
+TARGET_COLUMNS = ["effective_from", "role", "team", "person", "daily_target", "quality_target"]
+ROLES = ["Maker", "Editor"]
+FALLBACK_ROLE = "Editor"  # any other role is held to the editor target, as the pages always did
+DEFAULT_TARGETS = pd.DataFrame({
+    "effective_from": pd.to_datetime(["2000-01-01", "2000-01-01"]),
+    "role": ROLES, "team": [None, None], "person": [None, None],
+    "daily_target": [780, 1500], "quality_target": [80.0, 95.0],
+})
+
+
+def targets_path() -> Path:
+    return Path(get_setting("TARGETS_FILE", default=str(TARGETS_CSV)))
+
+
+def _read_targets(path: Path) -> pd.DataFrame:
+    table = pd.read_csv(path, dtype={"role": "string", "team": "string", "person": "string"})
+    table.columns = table.columns.str.strip().str.lower()
+    missing = [c for c in ("effective_from", "role", "daily_target") if c not in table.columns]
+    if missing:
+        raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+    for col in TARGET_COLUMNS:
+        if col not in table.columns:
+            table[col] = pd.NA
+    table["effective_from"] = pd.to_datetime(table["effective_from"], errors="coerce", format="mixed")
+    for col in ("role", "team", "person"):
+        table[col] = table[col].astype("string").str.strip().replace("", pd.NA)
+    table["daily_target"] = pd.to_numeric(table["daily_target"], errors="coerce")
+    table["quality_target"] = pd.to_numeric(table["quality_target"], errors="coerce")
+    table["person"] = roster.resolve(table["person"])["Canonical"].where(table["person"].notna())
+    return table.dropna(subset=["effective_from", "daily_target"])[TARGET_COLUMNS].reset_index(drop=True)
+
+
+def load_targets() -> pd.DataFrame:
+    """The targets table, re-read only when the file changes; built-in defaults when it is absent."""
+    path = targets_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return DEFAULT_TARGETS
+    return data_store.get("targets", f"{path}:{stat.st_mtime_ns}:{stat.st_size}", lambda: _read_targets(path))
+
+
+def _broadcast(values, n, index=None):
+    if values is None or np.ndim(values) == 0:
+        return pd.Series([values] * n, index=index, dtype="object")
+    if isinstance(values, pd.Series):
+        return values.astype("object") if index is None else values.astype("object").set_axis(index)
+    return pd.Series(np.asarray(values, dtype="object"), index=index)
+
+
+def resolve(dates, roles, names=None, teams=None, table=None) -> pd.DataFrame:
+    """'Daily Target' and 'Quality Target' in force for each (date, role, person) row.
+
+    Scalars broadcast. One as-of join per specificity level, so the whole frame is
+    resolved at once; dates before the table starts use its first version.
+    """
+    table = load_targets() if table is None else table
+    n = max((len(v) for v in (dates, roles, names) if v is not None and np.ndim(v) > 0), default=1)
+    index = next((v.index for v in (dates, roles, names) if isinstance(v, pd.Series)), pd.RangeIndex(n))
+    role = _broadcast(roles, n, index).astype("string").str.strip()
+    role = role.where(role.isin(table["role"].dropna().unique()), FALLBACK_ROLE)
+    person = _broadcast(names, n, index)
+    resolved = roster.resolve(person.astype("string")) if names is not None else None
+    query = pd.DataFrame({
+        "_pos": np.arange(n),
+        "date": pd.to_datetime(_broadcast(dates, n, index)).dt.normalize().astype("datetime64[us]").to_numpy(),
+        "role": role.astype("object").to_numpy(),
+        "person": resolved["Canonical"].to_numpy() if resolved is not None else None,
+        "team": (_broadcast(teams, n, index).to_numpy() if teams is not None
+                 else resolved["Team"].to_numpy() if resolved is not None else None),
+    }).dropna(subset=["date"]).sort_values("date", kind="stable")
+    query["date"] = query["date"].clip(lower=table["effective_from"].min())
+
+    levels = [
+        (["person"], table["person"].notna()),
+        (["team", "role"], table["person"].isna() & table["team"].notna()),
+        (["role"], table["person"].isna() & table["team"].isna()),
+    ]
+    out = pd.DataFrame({"Daily Target": np.nan, "Quality Target": np.nan}, index=np.arange(n))
+    for keys, mask in reversed(levels):
+        rows = table[mask]
+        if rows.empty or query[keys].isna().all().any():
+            continue
+        rows = (rows[["effective_from"] + keys + ["daily_target", "quality_target"]]
+                .astype({k: "object" for k in keys})
+                .astype({"effective_from": "datetime64[us]"})
+                .sort_values("effective_from"))
+        hit = pd.merge_asof(query.astype({k: "object" for k in keys}), rows, left_on="date",
+                            right_on="effective_from", by=keys, direction="backward").set_index("_pos")
+        found = hit["daily_target"].notna()
+        out.loc[hit.index[found], "Daily Target"] = hit.loc[found, "daily_target"].to_numpy()
+        out.loc[hit.index[found], "Quality Target"] = hit.loc[found, "quality_target"].to_numpy()
+    return out.set_axis(index)
+
+
+def period_targets(names, roles, days, available=None, table=None) -> pd.Series:
+    """Sum of each person's daily target over `days` (the period's working days), per input row.
+
+    `available` is an optional (rows × days) bool matrix (work_calendar.availability);
+    days a person is on leave carry no target.
+    """
+    days = pd.DatetimeIndex(days)
+    roles = _broadcast(roles, len(names) if names is not None else np.size(roles),
+                       names.index if isinstance(names, pd.Series) else None)
+    n = len(roles)
+    if n == 0 or len(days) == 0:
+        return pd.Series(0, index=roles.index, dtype="int64")
+    grid = resolve(
+        np.tile(days.to_numpy(), n),
+        np.repeat(roles.to_numpy(), len(days)),
+        np.repeat(np.asarray(names, dtype="object"), len(days)) if names is not None else None,
+        table=table,
+    )
+    daily = grid["Daily Target"].to_numpy().reshape(n, len(days))
+    if available is not None:
+        daily = np.where(available, daily, 0)
+    totals = np.nansum(daily, axis=1)
+    return pd.Series(totals, index=roles.index).round().astype("int64")
+
+
+def role_targets(date=None, table=None) -> pd.DataFrame:
+    """Role-wide targets in force on `date` (default today), one row per role."""
+    date = pd.Timestamp.today().normalize() if date is None else pd.Timestamp(date)
+    out = resolve(date, pd.Series(ROLES), table=table)
+    return out.assign(Role=ROLES)[["Role", "Daily Target", "Quality Target"]]
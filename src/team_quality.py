@@ -1,68 +1,21 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from .data_quality_loader import load_quality_data, SHEET_GID_MAP
-from .quality_performance_dashboard import calc_quality, classify_quality, text_color
-
-TEAM_STRUCTURE = {
-    "A": {"Coordinator": "Abhina", "Lead Editor": "Sharath",
-          "Members": ["Bhanushekar (AvinaShree)", "Abhinashree",
-                      "Priyanka (Mokshashree CM)", "PriyaPragathi (Sushmitha S)"]},
-    "B": {"Coordinator": "Aina", "Lead Editor": "Danny",
-          "Members": ["Chandu M", "Aarohi", "Kruthi", "Shivukumar"]},
-    "C": {"Coordinator": "Nayana", "Lead Editor": "Ravi",
-          "Members": ["Thashvi (Amulya)", "Jyothi (Arpitha)", "Deepika (Chandana)", "Nayana"]},
-    "D": {"Coordinator": "Dhanushree", "Lead Editor": "Vinod",
-          "Members": ["Nisarga", "Shilpa (Divya)", "Dhanushree", "Sneha KM"]},
-    "E": {"Coordinator": "Babu", "Lead Editor": "Ramesh",
-          "Members": ["Praveen (Babu M)", "Manu", "Abhishek", "Mohammad"]}
-}
-
-
-def _expand_aliases(name: str):
-    results = [name.strip()]
-    if '(' in name and ')' in name:
-        before, rest = name.split('(', 1)
-        before = before.strip()
-        inside = rest.split(')', 1)[0]
-        alts = [a.strip() for a in inside.replace('/', ',').split(',') if a.strip()]
-        results.extend([before] + alts)
-    return list(set(results))
-
-
-def _build_annotator_to_team():
-    mapping = {}
-    for team, info in TEAM_STRUCTURE.items():
-        all_names = [info["Coordinator"], info["Lead Editor"]] + info["Members"]
-        for n in all_names:
-            for alias in _expand_aliases(n):
-                mapping[alias] = team
-    return mapping
-
-
-def fetch_all_sheets():
-    dfs = []
-    for sheet in SHEET_GID_MAP.keys():
-        df = load_quality_data(sheet_name=sheet)
-        if not df.empty:
-            df["Sheet"] = sheet
-            dfs.append(df)
-    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
-
+from . import quality_store
+from .quality_dataset import load_quality_dataset
+from .quality_performance_dashboard import classify_quality, text_color
+from .roster import TEAM_STRUCTURE, annotator_to_team, expand_aliases, team_members
+from .profiler import span
+from .memory_monitor import track_frame
 
 def render_team_quality():
     st.title("👥 Team Quality Performance")
 
-    df = fetch_all_sheets()
+    df = load_quality_dataset()[0]["rows"]
     if df.empty:
         st.warning("No quality data available.")
         return
-
-    df = calc_quality(df)
-    df = df[df["Rename"].notna() & (df["Rename"] != "Select Names")]
-
-    annotator_to_team = _build_annotator_to_team()
-    df["Team"] = df["Rename"].apply(lambda x: annotator_to_team.get(x.strip(), "Unassigned"))
+    track_frame("team_quality.df", df)
 
     with st.sidebar:
         st.header("Filters")
@@ -83,10 +36,9 @@ def render_team_quality():
     st.subheader("📋 Team Members")
     members_list = []
     for team, info in TEAM_STRUCTURE.items():
-        raw_names = [info["Coordinator"], info["Lead Editor"]] + info["Members"]
         expanded = []
-        for n in raw_names:
-            expanded.extend(_expand_aliases(n))
+        for n in team_members(team):
+            expanded.extend(expand_aliases(n))
         members_list.append({
             "Team": team,
             "Coordinator": info["Coordinator"],
@@ -97,10 +49,18 @@ def render_team_quality():
 
     # Team comparison
     st.subheader("📊 Team Quality Comparison")
-    team_summary = df.groupby("Team").agg({
-        "Base Quality %": "mean", "Penalty %": "mean", "Quality %": "mean",
-        "Total Cuboids": "sum", "Missing Cuboids": "sum"
-    }).reset_index()
+    with span("team_quality.aggregate.teams"):
+        if date_range and len(date_range) == 2:
+            team_summary = df.groupby("Team").agg({
+                "Base Quality %": "mean", "Penalty %": "mean", "Quality %": "mean",
+                "Total Cuboids": "sum", "Missing Cuboids": "sum"
+            }).reset_index()
+        else:
+            # Rolled up from the store's running per-person sums
+            team_summary = quality_store.team_means(annotator_to_team())
+            if selected_team != "All":
+                team_summary = team_summary[team_summary["Team"] == selected_team]
+            team_summary = team_summary.reset_index(drop=True)
 
     col1, col2, col3 = st.columns(3)
     if not team_summary.empty:
@@ -113,7 +73,8 @@ def render_team_quality():
         color="Team:N",
         tooltip=["Team", "Base Quality %", "Penalty %", "Quality %", "Total Cuboids", "Missing Cuboids"]
     ).properties(height=400)
-    st.altair_chart(chart, use_container_width=True)
+    with span("team_quality.chart.comparison"):
+        st.altair_chart(chart, use_container_width=True)
 
     # Quality trend
     st.subheader("📈 Team Quality Trend Over Time")
@@ -122,7 +83,8 @@ def render_team_quality():
         x="Date_dt:T", y="Quality %:Q", color="Team:N",
         tooltip=["Date_dt", "Team", "Base Quality %", "Quality %"]
     ).properties(height=400)
-    st.altair_chart(line, use_container_width=True)
+    with span("team_quality.chart.trend"):
+        st.altair_chart(line, use_container_width=True)
 
     # Annotator performance
     st.subheader("👤 Annotator Performance by Team")
@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import calendar
+from .profiler import span, timed
+from .memory_monitor import track_frame
+from .targets import period_targets
+from .work_calendar import PERIOD_WEEKMASKS, availability, working_days
 
 # ---- Team roster (include aliases in parentheses; both will be recognized) ----
 TEAM_STRUCTURE = {
@@ -17,14 +21,11 @@ TEAM_STRUCTURE = {
          "Members": ["Praveen (Babu M)", "Manu", "Abhishek", "Mohammad"]}
 }
 
-# ---- Targets (keep in sync with performance_dashboard.py) ----
-MAKER_TARGET_DAILY = 750
-EDITOR_TARGET_DAILY = 1500
-
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
 
+@timed("team_structure._parse_dates")
 def _parse_dates(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     if 'Date' not in df.columns:
@@ -68,13 +69,6 @@ def _build_annotator_to_team() -> dict:
             m.setdefault(nm, team)
     return m
 
-def _daily_target_for_role(role: str) -> int:
-    return MAKER_TARGET_DAILY if role == 'Maker' else EDITOR_TARGET_DAILY
-
-def _working_days_excluding_sunday(start: pd.Timestamp, end: pd.Timestamp) -> int:
-    rng = pd.date_range(start, end, freq='D')
-    return int((rng.weekday != 6).sum())
-
 # ------------------------------------------------------------------
 # Period picker (Daily / Weekly / Monthly)
 # ------------------------------------------------------------------
@@ -88,7 +82,6 @@ def _select_period(df: pd.DataFrame):
         default_date = available[-1] if available else pd.Timestamp.today().date()
         sel_date = st.sidebar.date_input("Select date", value=default_date)
         start = end = pd.Timestamp(sel_date).normalize()
-        multiplier = 1
         label = f"{start.date()}"
     elif view_period == "Weekly":
         iso = df['Date_dt'].dt.isocalendar()
@@ -110,7 +103,6 @@ def _select_period(df: pd.DataFrame):
         sel = st.sidebar.selectbox("Select week", labels, index=len(labels) - 1)
         chosen = opts[labels.index(sel)]
         start, end = chosen[2], chosen[3]
-        multiplier = 5
         label = f"{start.date()} -> {end.date()}"
     else: # Monthly
         df_m = df.copy()
@@ -132,15 +124,15 @@ def _select_period(df: pd.DataFrame):
         sel = st.sidebar.selectbox("Select month", labels, index=len(labels) - 1)
         chosen = opts[labels.index(sel)]
         start, end = chosen[2], chosen[3]
-        multiplier = _working_days_excluding_sunday(start, end)
         label = f"{calendar.month_name[chosen[1]]} {chosen[0]}"
-        
+
+    days = working_days(start, end, PERIOD_WEEKMASKS[view_period])
     return {
         "view_period": view_period,
         "start_date": start,
         "end_date": end,
         "period_label": label,
-        "period_multiplier": multiplier
+        "period_days": days
     }
 
 # ------------------------------------------------------------------
@@ -169,11 +161,13 @@ def render_team_structure(df: pd.DataFrame):
     start_date = period["start_date"]
     end_date = period["end_date"]
     period_label = period["period_label"]
-    period_multiplier = period["period_multiplier"]
+    period_days = period["period_days"]
     
     st.subheader(f"{period['view_period']} Overview — {period_label}")
     
     df_period = df[(df['Date_dt'] >= start_date) & (df['Date_dt'] <= end_date)].copy()
+    track_frame("team_structure.df", df)
+    track_frame("team_structure.df_period", df_period)
     if df_period.empty:
         st.info("No records in the selected period.")
         return
@@ -200,17 +194,19 @@ def render_team_structure(df: pd.DataFrame):
             st.markdown("---")
             continue
             
-        per_person = team_df.groupby(['Rename', 'Role'])['Cuboids'].sum().reset_index().rename(columns={'Cuboids': 'Total Cuboids'})
-        per_person['Daily Target'] = per_person['Role'].apply(_daily_target_for_role)
-        per_person['Period Target'] = per_person['Daily Target'] * period_multiplier
-        per_person['Deficit'] = per_person['Total Cuboids'] - per_person['Period Target']
-        per_person['Target Met'] = per_person['Deficit'] >= 0
+        with span(f"team_structure.aggregate[{team}]"):
+            per_person = team_df.groupby(['Rename', 'Role'])['Cuboids'].sum().reset_index().rename(columns={'Cuboids': 'Total Cuboids'})
+            per_person['Period Target'] = period_targets(per_person['Rename'], per_person['Role'], period_days,
+                                                         available=availability(per_person['Rename'], period_days))
+            per_person['Deficit'] = per_person['Total Cuboids'] - per_person['Period Target']
+            per_person['Target Met'] = per_person['Deficit'] >= 0
         
-        st.dataframe(
-            per_person[['Rename', 'Role', 'Total Cuboids', 'Period Target', 'Deficit', 'Target Met']]
-            .sort_values('Total Cuboids', ascending=False)
-            .style.format({'Total Cuboids': '{:,}', 'Period Target': '{:,}', 'Deficit': '{:+,}'})
-            .map(lambda v: 'color: #2ca02c' if isinstance(v, (int, float)) and v >= 0 else 'color: #d62728', subset=['Deficit'])
-        )
+        with span(f"team_structure.table[{team}]"):
+            st.dataframe(
+                per_person[['Rename', 'Role', 'Total Cuboids', 'Period Target', 'Deficit', 'Target Met']]
+                .sort_values('Total Cuboids', ascending=False)
+                .style.format({'Total Cuboids': '{:,}', 'Period Target': '{:,}', 'Deficit': '{:+,}'})
+                .map(lambda v: 'color: #2ca02c' if isinstance(v, (int, float)) and v >= 0 else 'color: #d62728', subset=['Deficit'])
+            )
         st.markdown("---")
 
@@ -0,0 +1,124 @@
+# visionverse_dashboard/src/throughput_facts.py
+import numpy as np
+import pandas as pd
+from . import data_store, roster, targets
+from .data_loader import header_dates
+from .profiler import span
+from .settings import get_setting
+
+# One row per annotator per day: cuboids from the team sheet joined with the quality
+# reviews known as of that day, matched through the roster alias index. Volume and
+# quality targets are the ones in force that day (targets.py).
+DEFAULT_QUALITY_LOOKBACK_DAYS = 14
+FACT_COLUMNS = ["Date", "Team", "Canonical", "Role", "Cuboids", "Quality %", "Quality date", "Reviewed jobs",
+                "Adjusted Cuboids", "Daily Target", "Quality Target", "Volume Met", "Quality Met", "Both Met"]
+
+
+def quality_lookback_days() -> int:
+    try:
+        return int(get_setting("QUALITY_LOOKBACK_DAYS", default=DEFAULT_QUALITY_LOOKBACK_DAYS))
+    except (TypeError, ValueError):
+        return DEFAULT_QUALITY_LOOKBACK_DAYS
+
+
+def daily_output(team_df: pd.DataFrame) -> pd.DataFrame:
+    """Team sheet (long) -> cuboids per canonical annotator per day, with team and role."""
+    dates = team_df["Date_dt"] if "Date_dt" in team_df.columns else header_dates(team_df["Date"])
+    names = roster.resolve(team_df["Rename"])
+    frame = pd.DataFrame({
+        "Date": dates.astype("datetime64[ns]"),
+        "Canonical": names["Canonical"],
+        "Team": names["Team"],
+        "Role": team_df["Role"] if "Role" in team_df.columns else pd.NA,
+        "Cuboids": pd.to_numeric(team_df["Cuboids"], errors="coerce"),
+    }).dropna(subset=["Date", "Canonical", "Cuboids"])
+    return (frame.groupby(["Canonical", "Date"], sort=False)
+            .agg(Team=("Team", "first"), Role=("Role", "first"), Cuboids=("Cuboids", "sum"))
+            .reset_index())
+
+
+def daily_quality(quality_df: pd.DataFrame) -> pd.DataFrame:
+    """Scored quality rows -> mean Quality % and reviewed jobs per canonical annotator per day."""
+    if quality_df.empty:
+        return pd.DataFrame(columns=["Canonical", "Quality date", "Quality %", "Reviewed jobs"])
+    frame = pd.DataFrame({
+        "Canonical": quality_df["Canonical"],
+        "Quality date": quality_df["Date_dt"].dt.normalize().astype("datetime64[ns]"),
+        "Quality %": quality_df["Quality %"],
+    }).dropna(subset=["Canonical", "Quality date"])
+    return (frame.groupby(["Canonical", "Quality date"])
+            .agg(**{"Quality %": ("Quality %", "mean"), "Reviewed jobs": ("Quality %", "size")})
+            .reset_index())
+
+
+def build_facts(output: pd.DataFrame, quality: pd.DataFrame, lookback_days=None) -> pd.DataFrame:
+    """As-of join of daily output with the latest reviewed day within the lookback, plus dual-target flags.
+
+    Sorted by Date so period slices are a binary search.
+    """
+    lookback_days = quality_lookback_days() if lookback_days is None else lookback_days
+    left = output.sort_values("Date")
+    right = quality.sort_values("Quality date").astype({"Canonical": "object"})
+    facts = pd.merge_asof(
+        left.astype({"Canonical": "object"}), right, left_on="Date", right_on="Quality date", by="Canonical",
+        direction="backward", tolerance=pd.Timedelta(days=lookback_days),
+    )
+
+    in_force = targets.resolve(facts["Date"], facts["Role"], facts["Canonical"], facts["Team"])
+    facts["Daily Target"] = in_force["Daily Target"]
+    facts["Quality Target"] = in_force["Quality Target"]
+    facts["Adjusted Cuboids"] = facts["Cuboids"] * facts["Quality %"] / 100
+    facts["Volume Met"] = facts["Cuboids"] >= facts["Daily Target"]
+    facts["Quality Met"] = facts["Quality %"] >= facts["Quality Target"]
+    facts["Both Met"] = facts["Volume Met"] & facts["Quality Met"]
+    facts["Reviewed jobs"] = facts["Reviewed jobs"].fillna(0).astype("int64")
+    facts["Team"] = facts["Team"].astype("category")
+    return facts[FACT_COLUMNS].reset_index(drop=True)
+
+
+def facts_for(team_df: pd.DataFrame, quality_df: pd.DataFrame, team_version=None, quality_version=None):
+    """Fact table for the current team and quality data, built once per pair of data versions.
+
+    The daily output and daily quality sides are cached separately, so a new quality
+    version only redoes the quality roll-up and the join.
+    """
+    team_version = team_version or data_store.data_version(team_df)
+    quality_version = quality_version or data_store.data_version(quality_df)
+    lookback = quality_lookback_days()
+    table = targets.load_targets()
+    targets_version = data_store.data_version(table)
+    with span("throughput_facts.build"):
+        output = data_store.get("throughput_output", team_version, lambda: daily_output(team_df))
+        quality = data_store.get("throughput_quality", quality_version, lambda: daily_quality(quality_df))
+        return data_store.get("throughput_facts", f"{team_version}:{quality_version}:{lookback}:{targets_version}",
+                              lambda: build_facts(output, quality, lookback))
+
+
+def slice_facts(facts: pd.DataFrame, start=None, end=None, team=None) -> pd.DataFrame:
+    """Rows between start and end (inclusive) and optionally for one team."""
+    dates = facts["Date"].to_numpy()
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left")
+    hi = len(facts) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+    out = facts.iloc[lo:hi]
+    if team is not None:
+        out = out[out["Team"] == team]
+    return out
+
+
+def attainment(facts: pd.DataFrame, by="Canonical") -> pd.DataFrame:
+    """Per-group output, quality-adjusted output and the share of days meeting each target."""
+    g = facts.groupby(by, observed=True)
+    out = g.agg(**{
+        "Role": ("Role", "first"),
+        "Days": ("Date", "size"),
+        "Cuboids": ("Cuboids", "sum"),
+        "Adjusted Cuboids": ("Adjusted Cuboids", "sum"),
+        "Quality %": ("Quality %", "mean"),
+        "Days with quality": ("Quality %", "count"),
+        "Volume Met": ("Volume Met", "sum"),
+        "Quality Met": ("Quality Met", "sum"),
+        "Both Met": ("Both Met", "sum"),
+    })
+    out.loc[out["Days with quality"] == 0, "Adjusted Cuboids"] = np.nan
+    out["Dual-target %"] = out["Both Met"] / out["Days"] * 100
+    return out.reset_index().sort_values("Dual-target %", ascending=False, ignore_index=True)
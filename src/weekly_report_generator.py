@@ -3,14 +3,17 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import calendar
+from .profiler import span, timed
+from .memory_monitor import track_frame
+from .targets import period_targets
+from .work_calendar import PERIOD_WEEKMASKS, availability, working_days
 
-# Keep these constants in sync with performance_dashboard.py
-MAKER_TARGET_DAILY = 780
-EDITOR_TARGET_DAILY = 1500
+# Team sizes; per-head daily targets live in data/targets.csv
 MAKERS_COUNT = 20
 EDITORS_COUNT = 10
 WEEK_WORKING_DAYS = 5  # Mon-Fri
 
+@timed("weekly._parse_dates_for_report")
 def _parse_dates_for_report(df):
     df = df.copy()
     today = pd.Timestamp.today().normalize()
@@ -94,18 +97,20 @@ def render_weekly_report(df):
     st.subheader(f"Weekly Overview — {sel_label}")
 
     week_df = df[(df['Date_dt'] >= start_date) & (df['Date_dt'] <= end_date)].copy()
+    track_frame("weekly.df", df)
+    track_frame("weekly.week_df", week_df)
     if week_df.empty:
         st.info("No records found in the selected week range.")
         return
 
-    person_agg = week_df.groupby(['Role', 'Rename'], as_index=False)['Cuboids'].sum().rename(columns={'Cuboids': 'Total Cuboids'})
-    person_agg = person_agg.sort_values(['Role', 'Total Cuboids'], ascending=[True, False])
+    with span("weekly.aggregate"):
+        person_agg = week_df.groupby(['Role', 'Rename'], as_index=False)['Cuboids'].sum().rename(columns={'Cuboids': 'Total Cuboids'})
+        person_agg = person_agg.sort_values(['Role', 'Total Cuboids'], ascending=[True, False])
 
-    maker_target_week = MAKER_TARGET_DAILY * WEEK_WORKING_DAYS
-    editor_target_week = EDITOR_TARGET_DAILY * WEEK_WORKING_DAYS
-    person_agg['Weekly Target'] = person_agg['Role'].apply(
-        lambda r: maker_target_week if r == 'Maker' else editor_target_week
-    )
+    week_days = working_days(start_date, end_date, PERIOD_WEEKMASKS["Weekly"])
+    maker_target_week, editor_target_week = (int(t) for t in period_targets(None, ['Maker', 'Editor'], week_days))
+    person_agg['Weekly Target'] = period_targets(person_agg['Rename'], person_agg['Role'], week_days,
+                                                 available=availability(person_agg['Rename'], week_days))
     person_agg['Deficit'] = person_agg['Total Cuboids'] - person_agg['Weekly Target']
 
     st.markdown("### ⚠️ Individuals Below Target")
@@ -193,8 +198,9 @@ def render_weekly_report(df):
             color='Role:N',
             tooltip=['Rename', 'Role', 'Total Cuboids']
         ).properties(height=320)
-        st.altair_chart(chart, use_container_width=True)
+        with span("weekly.chart.top10"):
+            st.altair_chart(chart, use_container_width=True)
     else:
         st.write("No data for chart.")
 
-    st.caption(f"Week treated as Mon → Fri ({WEEK_WORKING_DAYS} working days). Per-head targets: Maker {MAKER_TARGET_DAILY} × {WEEK_WORKING_DAYS} = {maker_target_week}, Editor {EDITOR_TARGET_DAILY} × {WEEK_WORKING_DAYS} = {editor_target_week}.")
+    st.caption(f"Week treated as Mon → Fri ({len(week_days)} working days after holidays; leave lowers individual targets). Per-head targets (sum of each day's target): Maker {maker_target_week:,}, Editor {editor_target_week:,}.")
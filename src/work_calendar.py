@@ -0,0 +1,128 @@
+# visionverse_dashboard/src/work_calendar.py
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from . import data_store, roster
+from .settings import get_setting
+
+# Working days per person and period, from numpy business-day calendars. A day counts
+# when the period's weekmask allows it, it is not in data/holidays.csv, and the person
+# has no leave on it in data/leave.csv (inclusive start/end dates).
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+HOLIDAYS_CSV = DATA_DIR / "holidays.csv"
+LEAVE_CSV = DATA_DIR / "leave.csv"
+
+# Each view keeps the working week it has always used
+PERIOD_WEEKMASKS = {
+    "Daily": "1111111",
+    "Weekly": "1111100",   # Mon-Fri
+    "Monthly": "1111110",  # all but Sunday
+}
+
+
+def _load_versioned(name, setting, default_path, reader, empty):
+    path = Path(get_setting(setting, default=str(default_path)))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return empty
+    return data_store.get(name, f"{path}:{stat.st_mtime_ns}:{stat.st_size}", lambda: reader(path))
+
+
+def _read_holidays(path):
+    table = pd.read_csv(path)
+    table.columns = table.columns.str.strip().str.lower()
+    dates = pd.to_datetime(table["date"], errors="coerce", format="mixed").dropna()
+    return np.unique(dates.to_numpy().astype("datetime64[D]"))
+
+
+def _read_leave(path):
+    table = pd.read_csv(path, dtype={"person": "string"})
+    table.columns = table.columns.str.strip().str.lower()
+    start = pd.to_datetime(table["start"], errors="coerce", format="mixed")
+    end = pd.to_datetime(table["end"], errors="coerce", format="mixed").fillna(start)
+    leave = pd.DataFrame({
+        "person": roster.resolve(table["person"])["Canonical"],
+        "start": start.to_numpy().astype("datetime64[D]"),
+        "end": end.to_numpy().astype("datetime64[D]"),
+    }).dropna()
+    return leave[leave["end"] >= leave["start"]].reset_index(drop=True)
+
+
+def holidays() -> np.ndarray:
+    """Holiday dates (datetime64[D], sorted); empty when no holidays file exists."""
+    return _load_versioned("holidays", "HOLIDAYS_FILE", HOLIDAYS_CSV, _read_holidays,
+                           np.array([], dtype="datetime64[D]"))
+
+
+def leave() -> pd.DataFrame:
+    """Leave spans: canonical person, start, end (inclusive)."""
+    return _load_versioned("leave", "LEAVE_FILE", LEAVE_CSV, _read_leave,
+                           pd.DataFrame({"person": pd.Series(dtype="object"),
+                                         "start": pd.Series(dtype="datetime64[s]"),
+                                         "end": pd.Series(dtype="datetime64[s]")}))
+
+
+def busday_calendar(weekmask="1111110") -> np.busdaycalendar:
+    return np.busdaycalendar(weekmask=weekmask, holidays=holidays())
+
+
+def _day(value):
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def working_days(start, end, weekmask="1111110") -> pd.DatetimeIndex:
+    """Team working days between start and end, inclusive."""
+    start, end = _day(start), _day(end)
+    if end < start:
+        return pd.DatetimeIndex([])
+    days = np.arange(start, end + 1, dtype="datetime64[D]")
+    return pd.DatetimeIndex(days[np.is_busday(days, busdaycal=busday_calendar(weekmask))])
+
+
+def count_working_days(start, end, weekmask="1111110") -> int:
+    """Team working days between start and end, inclusive (0 when end < start)."""
+    start, end = _day(start), _day(end)
+    return int(np.busday_count(start, end + 1, busdaycal=busday_calendar(weekmask))) if end >= start else 0
+
+
+def availability(names, days) -> np.ndarray:
+    """(len(names), len(days)) bool: False where the person is on leave that day."""
+    days = pd.DatetimeIndex(days).to_numpy().astype("datetime64[D]")
+    people = roster.resolve(pd.Series(list(names), dtype="string"))["Canonical"].to_numpy()
+    spans = leave()
+    available = np.ones((len(people), len(days)), dtype=bool)
+    if spans.empty or len(days) == 0 or len(people) == 0:
+        return available
+    codes, distinct = pd.factorize(pd.Series(people, dtype="object"))
+    spans = spans[spans["person"].isin(distinct)]
+    if spans.empty:
+        return available
+    # (spans × days) overlap, folded onto the distinct people they belong to
+    on_leave = ((days[None, :] >= spans["start"].to_numpy()[:, None].astype("datetime64[D]"))
+                & (days[None, :] <= spans["end"].to_numpy()[:, None].astype("datetime64[D]")))
+    by_person = np.zeros((len(distinct), len(days)), dtype=bool)
+    np.logical_or.at(by_person, distinct.get_indexer(spans["person"]), on_leave)
+    known = codes >= 0
+    available[known] = ~by_person[codes[known]]
+    return available
+
+
+def person_days(names, start, end, weekmask="1111110", as_of=None) -> pd.DataFrame:
+    """Per person: working days in the period, days elapsed up to `as_of` (inclusive) and days remaining.
+
+    One calendar mask over the period combined with the leave matrix, so the whole
+    roster is counted at once.
+    """
+    names = names if isinstance(names, pd.Series) else pd.Series(list(names), dtype="object")
+    days = working_days(start, end, weekmask)
+    mask = availability(names, days)
+    as_of = pd.Timestamp.today().normalize() if as_of is None else pd.Timestamp(as_of).normalize()
+    elapsed = np.asarray(days <= as_of)
+    return pd.DataFrame({
+        "Working days": mask.sum(axis=1),
+        "Days passed": mask[:, elapsed].sum(axis=1),
+        "Days remaining": mask[:, ~elapsed].sum(axis=1),
+    }, index=names.index)
@@ -1,13 +1,18 @@
 # visionverse_dashboard/streamlit_app.py
 import streamlit as st
+import pandas as pd
 from src.data_loader import load_team_data
 from src.performance_dashboard import render_dashboard
 from src.weekly_report_generator import render_weekly_report
-#from src.data_validation import render_data_validation
+from src.data_validation import render_data_validation
 from streamlit_autorefresh import st_autorefresh
 from src.team_structure import render_team_structure
 from src.quality_performance_dashboard import render_quality_dashboard
 from src.team_quality import render_team_quality
+from src.review_tool import render_review_tool
+from src.targets import role_targets
+from src.profiler import begin_rerun, end_rerun, render_profiler_panel, span
+from src import data_store, memory_monitor
 # Auto-refresh every 600 seconds
 st_autorefresh(interval=600000, key="data_refresh")
 
@@ -49,47 +54,71 @@ role_map = {
 # Sidebar Navigation
 st.sidebar.title("📊 VisonVerse Dashboard")
 page = st.sidebar.radio("Go to", [
-    "Home", "Performance Dashboard", "Weekly Report", "Team Structure", "Quality Performance", "Team Quality"
+    "Home", "Performance Dashboard", "Weekly Report", "Team Structure", "Quality Performance", "Team Quality", "Review Tracker",
+    "Data Validation"
 ])
+show_profiler = st.sidebar.checkbox("⏱️ Show profiler", value=False)
+show_memory = st.sidebar.checkbox("🧠 Show memory", value=False)
+begin_rerun(page)
+memory_monitor.begin_rerun(show_memory)
 
 
 # Load fresh data every 10 minutes without page reload
 st.cache_data.clear()  # clear all cached datasets on every run
-df = load_team_data(role_map)
+with span("load_team_data"):
+    df = load_team_data(role_map)
 
 if df.empty:
     st.error("No data found from Google Sheet.")
     st.stop()
 
+if df.attrs.get("stale"):
+    fetched = pd.Timestamp(df.attrs["fetched_at"], unit="s").strftime("%Y-%m-%d %H:%M UTC")
+    st.warning(f"⚠️ Google Sheet is unreachable ({df.attrs.get('fetch_error')}). Showing last known good data from {fetched}.")
+
+# One shared copy per data version instead of one per session
+df, data_version = data_store.share("team_data", df)
+
 if page == "Home":
     st.title("👁️ VisonVerse Annotation Dashboard")
-    st.markdown("""
+    current_targets = role_targets().set_index("Role")
+    st.markdown(f"""
 Welcome to the VisonVerse QA Dashboard.
 
 **Roles**:
-- **Makers** → 780/day (≥80% quality)  
-- **Editors** → 1500/day (≥95% quality)  
+- **Makers** → {current_targets.loc['Maker', 'Daily Target']:,.0f}/day (≥{current_targets.loc['Maker', 'Quality Target']:.0f}% quality)  
+- **Editors** → {current_targets.loc['Editor', 'Daily Target']:,.0f}/day (≥{current_targets.loc['Editor', 'Quality Target']:.0f}% quality)  
 
 Data updates from Google Sheets every 1 minute automatically (no reload).
 """)
 
 elif page == "Performance Dashboard":
-    render_dashboard(df)
+    with span("render_dashboard"):
+        render_dashboard(df, data_version)
 
 elif page == "Weekly Report":
-    render_weekly_report(df)
+    with span("render_weekly_report"):
+        render_weekly_report(df)
 
 elif page == "Team Structure":
-    render_team_structure(df)
+    with span("render_team_structure"):
+        render_team_structure(df)
 
 elif page == "Quality Performance":
-    render_quality_dashboard()
+    with span("render_quality_dashboard"):
+        render_quality_dashboard()
 
 elif page == "Team Quality":
-    render_team_quality()
+    with span("render_team_quality"):
+        render_team_quality()
 
-#elif page == "Data Validation":
-    #render_data_validation(df)
+elif page == "Review Tracker":
+    with span("render_review_tool"):
+        render_review_tool()
+
+elif page == "Data Validation":
+    with span("render_data_validation"):
+        render_data_validation(df, data_version)
 
 # Footer
 st.markdown("---")
@@ -97,3 +126,9 @@ st.markdown(
     "<p style='text-align:center;font-weight:bold'>✨ Dashboard built by <span style='color:#d62828'>Vinod M</span> ✨</p>",
     unsafe_allow_html=True
 )
+
+if show_profiler:
+    render_profiler_panel()
+if show_memory:
+    memory_monitor.render_memory_panel()
+end_rerun()